@@ -5,11 +5,22 @@ Provides tools for managing and tracking hardware/software assets
 
 import asyncio
 import json
-from datetime import datetime, timedelta
+import os
+import sys
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 
 def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_tools=None, **extra):
     """Build a rich error response that remains compatible with existing clients."""
@@ -27,410 +38,127 @@ def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_t
     return payload
 
 
-# Sample asset data
-ASSETS = [
-    {
-        "asset_id": "AST-WKS-001",
-        "serial_number": "5CD23456ABC",
-        "hostname": "wks-techcorp-01.techcorp.local",
-        "asset_type": "workstation",
-        "customer_id": "CUST-001",
-        "manufacturer": "Dell",
-        "model": "OptiPlex 7090",
-        "status": "active",
-        "location": "TechCorp HQ - Floor 3",
-        "purchase_date": "2024-01-15",
-        "warranty": {
-            "status": "active",
-            "start_date": "2024-01-15",
-            "end_date": "2027-01-15",
-            "coverage_type": "ProSupport Plus",
-            "remaining_days": 450
-        },
-        "specs": {
-            "cpu": "Intel Core i7-11700",
-            "ram_gb": 32,
-            "storage": "512GB NVMe SSD",
-            "os": "Windows 11 Pro"
-        },
-        "assigned_to": "david.chen@techcorp.com",
-        "last_maintenance": "2025-08-10"
-    },
-    {
-        "asset_id": "AST-SRV-001",
-        "serial_number": "VMW-789-XYZ-456",
-        "hostname": "sql-prod-01.dataflow.local",
-        "asset_type": "server",
-        "customer_id": "CUST-002",
-        "manufacturer": "HPE",
-        "model": "ProLiant DL380 Gen10",
-        "status": "active",
-        "location": "DataFlow Data Center - Rack 12",
-        "purchase_date": "2023-06-20",
-        "warranty": {
-            "status": "active",
-            "start_date": "2023-06-20",
-            "end_date": "2026-06-20",
-            "coverage_type": "24x7 4-hour response",
-            "remaining_days": 258
-        },
-        "specs": {
-            "cpu": "2x Intel Xeon Gold 6226R",
-            "ram_gb": 256,
-            "storage": "8x 1.2TB SAS HDD (RAID 10)",
-            "os": "Ubuntu Server 22.04 LTS"
-        },
-        "assigned_to": "Infrastructure Team",
-        "last_maintenance": "2025-09-15",
-        "software_licenses": [
-            {
-                "software": "Microsoft SQL Server 2022 Enterprise",
-                "license_key": "XXXXX-XXXXX-XXXXX-XXXXX",
-                "expiration": "2026-06-01",
-                "type": "perpetual"
-            }
-        ]
-    },
-    {
-        "asset_id": "AST-WKS-002",
-        "serial_number": "C02YZ8JKLVCG",
-        "hostname": "mbp-globalent-exec",
-        "asset_type": "laptop",
-        "customer_id": "CUST-003",
-        "manufacturer": "Apple",
-        "model": "MacBook Pro 16-inch M3 Max",
-        "status": "active",
-        "location": "Remote - Executive",
-        "purchase_date": "2024-11-10",
-        "warranty": {
-            "status": "active",
-            "start_date": "2024-11-10",
-            "end_date": "2025-11-10",
-            "coverage_type": "AppleCare+",
-            "remaining_days": 36
-        },
-        "specs": {
-            "cpu": "Apple M3 Max",
-            "ram_gb": 64,
-            "storage": "2TB SSD",
-            "os": "macOS Sonoma 14.6"
-        },
-        "assigned_to": "robert.t@globalent.com",
-        "last_maintenance": "2025-09-01"
-    },
-    {
-        "asset_id": "AST-SRV-002",
-        "serial_number": "SRV-INV-2023-445",
-        "hostname": "web-app-01.innovatesys.net",
-        "asset_type": "server",
-        "customer_id": "CUST-004",
-        "manufacturer": "Supermicro",
-        "model": "SuperServer 1029P",
-        "status": "active",
-        "location": "AWS us-east-1 (Virtual)",
-        "purchase_date": "2023-08-22",
-        "warranty": {
-            "status": "active",
-            "start_date": "2023-08-22",
-            "end_date": "2025-08-22",
-            "coverage_type": "Standard support",
-            "remaining_days": -45
-        },
-        "specs": {
-            "cpu": "Intel Xeon Silver 4210R",
-            "ram_gb": 64,
-            "storage": "2TB NVMe SSD",
-            "os": "Ubuntu 24.04 LTS"
-        },
-        "assigned_to": "DevOps Team",
-        "last_maintenance": "2025-07-20",
-        "software_licenses": [
-            {
-                "software": "NGINX Plus",
-                "license_key": "NGX-PLUS-2024-XXX",
-                "expiration": "2025-12-31",
-                "type": "subscription"
-            }
-        ]
-    },
-    {
-        "asset_id": "AST-WKS-003",
-        "serial_number": "DT-CF-789-2022",
-        "hostname": "dev-wks-cloudfirst-05",
-        "asset_type": "workstation",
-        "customer_id": "CUST-005",
-        "manufacturer": "Lenovo",
-        "model": "ThinkStation P620",
-        "status": "active",
-        "location": "CloudFirst - Development Lab",
-        "purchase_date": "2022-11-05",
-        "warranty": {
-            "status": "expired",
-            "start_date": "2022-11-05",
-            "end_date": "2025-11-05",
-            "coverage_type": "Premier Support",
-            "remaining_days": -31
-        },
-        "specs": {
-            "cpu": "AMD Threadripper PRO 5975WX",
-            "ram_gb": 128,
-            "storage": "2TB NVMe SSD + 4TB HDD",
-            "os": "Windows 11 Pro for Workstations"
-        },
-        "assigned_to": "tom.w@cloudfirst.cloud",
-        "last_maintenance": "2025-06-15",
-        "software_licenses": [
-            {
-                "software": "VMware Workstation Pro",
-                "license_key": "VMW-XXXXX-XXXXX",
-                "expiration": "perpetual",
-                "type": "perpetual"
-            },
-            {
-                "software": "Visual Studio Enterprise 2022",
-                "license_key": "VS-ENT-XXXXX",
-                "expiration": "2026-01-15",
-                "type": "subscription"
-            }
-        ]
-    },
-    {
-        "asset_id": "AST-NET-001",
-        "serial_number": "CISCO-C9300-48P-SN123",
-        "hostname": "sw-core-01.securenet.local",
-        "asset_type": "network",
-        "customer_id": "CUST-006",
-        "manufacturer": "Cisco",
-        "model": "Catalyst 9300-48P",
-        "status": "active",
-        "location": "SecureNet - Main IDF",
-        "purchase_date": "2024-06-01",
-        "warranty": {
-            "status": "active",
-            "start_date": "2024-06-01",
-            "end_date": "2027-06-01",
-            "coverage_type": "SMARTnet 8x5xNBD",
-            "remaining_days": 604
-        },
-        "specs": {
-            "ports": "48x 1G PoE+",
-            "uplinks": "4x 10G SFP+",
-            "power": "Dual redundant PSU",
-            "firmware": "IOS-XE 17.9.4"
-        },
-        "assigned_to": "Network Infrastructure",
-        "last_maintenance": "2025-09-20"
-    },
-    {
-        "asset_id": "AST-SRV-003",
-        "serial_number": "HPE-DL360-G10-789456",
-        "hostname": "dc01.megacorp.local",
-        "asset_type": "server",
-        "customer_id": "CUST-007",
-        "manufacturer": "HPE",
-        "model": "ProLiant DL360 Gen10",
-        "status": "active",
-        "location": "MegaCorp HQ - Server Room A",
-        "purchase_date": "2022-03-10",
-        "warranty": {
-            "status": "active",
-            "start_date": "2022-03-10",
-            "end_date": "2027-03-10",
-            "coverage_type": "5-year 24x7 4-hour response",
-            "remaining_days": 521
-        },
-        "specs": {
-            "cpu": "2x Intel Xeon Gold 6230",
-            "ram_gb": 192,
-            "storage": "4x 900GB SAS (RAID 5)",
-            "os": "Windows Server 2019 Standard"
-        },
-        "assigned_to": "IT Infrastructure",
-        "last_maintenance": "2025-08-25",
-        "software_licenses": [
-            {
-                "software": "Windows Server 2019 Standard",
-                "license_key": "WIN-SRV-2019-XXX",
-                "expiration": "perpetual",
-                "type": "perpetual"
-            },
-            {
-                "software": "Veeam Backup & Replication",
-                "license_key": "VEEAM-XXX-YYY",
-                "expiration": "2026-03-01",
-                "type": "subscription"
-            }
-        ]
-    },
-    {
-        "asset_id": "AST-SRV-004",
-        "serial_number": "DELL-R740-XD-998877",
-        "hostname": "docker-host-01.megacorp.local",
-        "asset_type": "server",
-        "customer_id": "CUST-007",
-        "manufacturer": "Dell",
-        "model": "PowerEdge R740xd",
-        "status": "active",
-        "location": "MegaCorp HQ - Server Room B",
-        "purchase_date": "2023-07-15",
-        "warranty": {
-            "status": "active",
-            "start_date": "2023-07-15",
-            "end_date": "2026-07-15",
-            "coverage_type": "ProSupport Plus 24x7",
-            "remaining_days": 283
-        },
-        "specs": {
-            "cpu": "2x Intel Xeon Gold 6248R",
-            "ram_gb": 384,
-            "storage": "12x 4TB SATA (RAID 6)",
-            "os": "Red Hat Enterprise Linux 9"
-        },
-        "assigned_to": "Container Platform Team",
-        "last_maintenance": "2025-09-10",
-        "software_licenses": [
-            {
-                "software": "Red Hat Enterprise Linux",
-                "license_key": "RHEL-SUB-XXXXX",
-                "expiration": "2026-07-15",
-                "type": "subscription"
-            },
-            {
-                "software": "Docker Enterprise",
-                "license_key": "DOCKER-EE-XXXXX",
-                "expiration": "2026-01-01",
-                "type": "subscription"
-            }
-        ]
-    },
-    {
-        "asset_id": "AST-WKS-004",
-        "serial_number": "ASUS-PN64-456789",
-        "hostname": "kiosk-startuphub-lobby",
-        "asset_type": "workstation",
-        "customer_id": "CUST-008",
-        "manufacturer": "ASUS",
-        "model": "PN64 Mini PC",
-        "status": "active",
-        "location": "StartupHub - Lobby",
-        "purchase_date": "2024-02-28",
-        "warranty": {
-            "status": "active",
-            "start_date": "2024-02-28",
-            "end_date": "2027-02-28",
-            "coverage_type": "3-year on-site",
-            "remaining_days": 511
-        },
-        "specs": {
-            "cpu": "Intel Core i5-12500H",
-            "ram_gb": 16,
-            "storage": "256GB NVMe SSD",
-            "os": "Ubuntu 22.04 LTS"
-        },
-        "assigned_to": "Public Kiosk",
-        "last_maintenance": "2025-09-01"
-    },
-    {
-        "asset_id": "AST-SRV-005",
-        "serial_number": "SH-VM-CLUSTER-01",
-        "hostname": "k8s-master-01.startuphub.local",
-        "asset_type": "server",
-        "customer_id": "CUST-008",
-        "manufacturer": "Dell",
-        "model": "PowerEdge R650",
-        "status": "active",
-        "location": "Colocation - Digital Realty SJC",
-        "purchase_date": "2024-03-15",
-        "warranty": {
-            "status": "active",
-            "start_date": "2024-03-15",
-            "end_date": "2027-03-15",
-            "coverage_type": "ProSupport 24x7",
-            "remaining_days": 526
-        },
-        "specs": {
-            "cpu": "2x Intel Xeon Silver 4314",
-            "ram_gb": 128,
-            "storage": "4x 960GB SSD (RAID 10)",
-            "os": "Ubuntu Server 22.04 LTS"
-        },
-        "assigned_to": "Platform Team",
-        "last_maintenance": "2025-08-30",
-        "software_licenses": [
-            {
-                "software": "Rancher Enterprise",
-                "license_key": "RANCHER-XXX-YYY",
-                "expiration": "2026-03-15",
-                "type": "subscription"
-            }
-        ]
-    },
-    {
-        "asset_id": "AST-STOR-001",
-        "serial_number": "SYNOLOGY-RS2421-887654",
-        "hostname": "nas-backup-01.dataflow.local",
-        "asset_type": "storage",
-        "customer_id": "CUST-002",
-        "manufacturer": "Synology",
-        "model": "RackStation RS2421+",
-        "status": "active",
-        "location": "DataFlow - Backup Room",
-        "purchase_date": "2023-09-10",
-        "warranty": {
-            "status": "active",
-            "start_date": "2023-09-10",
-            "end_date": "2026-09-10",
-            "coverage_type": "3-year warranty",
-            "remaining_days": 340
-        },
-        "specs": {
-            "cpu": "AMD Ryzen V1500B",
-            "ram_gb": 32,
-            "bays": "12-bay",
-            "capacity": "96TB usable (RAID 6)",
-            "os": "DSM 7.2"
-        },
-        "assigned_to": "Backup Infrastructure",
-        "last_maintenance": "2025-07-15"
-    },
-    {
-        "asset_id": "AST-WKS-005",
-        "serial_number": "FRAMEWORK-13-GEN3-55443",
-        "hostname": "laptop-innovate-mobile",
-        "asset_type": "laptop",
-        "customer_id": "CUST-004",
-        "manufacturer": "Framework",
-        "model": "Framework Laptop 13 (Intel 13th Gen)",
-        "status": "active",
-        "location": "Remote - Field Engineer",
-        "purchase_date": "2024-05-20",
-        "warranty": {
-            "status": "active",
-            "start_date": "2024-05-20",
-            "end_date": "2025-05-20",
-            "coverage_type": "Standard 1-year",
-            "remaining_days": 7
-        },
-        "specs": {
-            "cpu": "Intel Core i7-1370P",
-            "ram_gb": 32,
-            "storage": "1TB NVMe SSD",
-            "os": "Fedora 40 Workstation"
-        },
-        "assigned_to": "michael.d@innovatesys.net",
-        "last_maintenance": "2025-08-10",
-        "software_licenses": [
-            {
-                "software": "JetBrains All Products Pack",
-                "license_key": "JETBRAINS-XXX",
-                "expiration": "2026-05-20",
-                "type": "subscription"
-            }
-        ]
-    }
-]
+def freeze(value):
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Recursively copy frozen data back into plain dicts and lists for responses"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+# Tool responses are compact JSON by default; set MCP_PRETTY=1 to indent them for debugging
+PRETTY_JSON = os.getenv("MCP_PRETTY") == "1"
+
+
+# Keys that stay in tool responses even when empty, because clients rely on them being present
+REQUIRED_RESPONSE_KEYS = frozenset({"assets", "licenses", "history"})
+
+
+def compact_result(value):
+    """Recursively drop None, empty strings, empty lists and empty dicts from a tool result."""
+    if isinstance(value, dict):
+        compacted = {}
+        for key, item in value.items():
+            item = compact_result(item)
+            if item is None or item == "" or item == [] or item == {}:
+                if key not in REQUIRED_RESPONSE_KEYS:
+                    continue
+            compacted[key] = item
+        return compacted
+    if isinstance(value, (list, tuple)):
+        return [compact_result(item) for item in value]
+    return value
+
+
+def serialize_result(result):
+    """Serialize a tool result for TextContent, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if PRETTY_JSON:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(result, option=option).decode()
+    if PRETTY_JSON:
+        return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"))
 
 
+def respond(result):
+    """Compact and serialize a tool result for TextContent"""
+    return serialize_result(compact_result(result))
+
+
+# Sample asset data lives in assets.json next to this module
+ASSETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets.json")
+
+
+def load_assets(path=ASSETS_FILE):
+    """Load the asset dataset from its JSON file"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+ASSETS = load_assets()
+
+# Intern the repeated identifier/category strings so index lookups and equality checks
+# can short-circuit on identity
+for _asset in ASSETS:
+    for _field in ("asset_id", "asset_type", "status", "customer_id"):
+        _asset[_field] = sys.intern(_asset[_field])
+
+# Freeze the dataset: the records are shared by indexes and cached responses, so
+# nothing may mutate them in place
+ASSETS = tuple(freeze(a) for a in ASSETS)
+
+# Lookup indexes built once at import so tools don't rescan ASSETS on every call; read them
+# through index_get, since tool arguments may be unhashable
+_ASSETS_BY_ID = {a["asset_id"]: a for a in ASSETS}
+_ASSETS_BY_CUSTOMER = defaultdict(list)
+for _asset in ASSETS:
+    _ASSETS_BY_CUSTOMER[_asset["customer_id"]].append(_asset)
+
+# Searching works on row positions into ASSETS: identifier -> position indexes plus
+# per-field columns, so matching never touches the full asset dicts
+_ASSET_POSITIONS = {a["asset_id"]: i for i, a in enumerate(ASSETS)}
+_SERIAL_POSITIONS = {a["serial_number"].lower(): i for i, a in enumerate(ASSETS)}
+_CUSTOMER_POSITIONS = defaultdict(list)
+for _position, _asset in enumerate(ASSETS):
+    _CUSTOMER_POSITIONS[_asset["customer_id"]].append(_position)
+_COL_HOSTNAME_LOWER = tuple(a["hostname"].lower() for a in ASSETS)
+
+# Listing rows returned by lookup_asset when several assets match, built once per asset
+_ASSET_SUMMARIES = tuple(
+    {"asset_id": a["asset_id"], "serial_number": a["serial_number"], "hostname": a["hostname"], "asset_type": a["asset_type"], "customer_id": a["customer_id"], "manufacturer": a["manufacturer"], "model": a["model"], "status": a["status"]}
+    for a in ASSETS
+)
+
+# Trigram -> asset positions, so partial hostname queries only verify a short candidate list
+_HOST_TRIGRAMS = defaultdict(set)
+for _position, _host in enumerate(_COL_HOSTNAME_LOWER):
+    for _i in range(len(_host) - 2):
+        _HOST_TRIGRAMS[_host[_i:_i + 3]].add(_position)
+
+
+
+
+def index_get(index, key, default=None):
+    """index.get(key, default), treating unhashable keys (e.g. lists) as no match"""
+    try:
+        return index.get(key, default)
+    except TypeError:
+        return default
 
 
 # ============================================================================
@@ -439,8 +167,8 @@ ASSETS = [
 
 def lookup_asset(asset_id=None, serial_number=None, hostname=None, customer_id=None):
     """Look up asset(s). Can be called directly."""
-    assets = search_assets(asset_id=asset_id, serial_number=serial_number, hostname=hostname, customer_id=customer_id)
-    if not assets:
+    positions = search_asset_positions(asset_id=asset_id, serial_number=serial_number, hostname=hostname, customer_id=customer_id)
+    if not positions:
         return make_error(
             "No assets found matching criteria",
             reason="The identifiers did not match any assets in the dataset.",
@@ -452,18 +180,21 @@ def lookup_asset(asset_id=None, serial_number=None, hostname=None, customer_id=N
             follow_up_tools=["lookup_asset"],
             search_criteria={k: v for k, v in {"asset_id": asset_id, "serial_number": serial_number, "hostname": hostname, "customer_id": customer_id}.items() if v}
         )
-    elif len(assets) == 1:
-        result = assets[0].copy()
+    elif len(positions) == 1:
+        asset = ASSETS[positions[0]]
+        result = thaw(asset)
         if "warranty" in result:
-            result["warranty"]["remaining_days"] = calculate_warranty_days(result["warranty"]["end_date"])
+            result["warranty"]["remaining_days"] = _get_warranty_view(asset)["remaining_days"]
         return result
     else:
-        return {"assets": [{"asset_id": a["asset_id"], "serial_number": a["serial_number"], "hostname": a["hostname"], "asset_type": a["asset_type"], "customer_id": a["customer_id"], "manufacturer": a["manufacturer"], "model": a["model"], "status": a["status"]} for a in assets], "total_count": len(assets)}
+        return {"assets": [_ASSET_SUMMARIES[i] for i in positions], "total_count": len(positions)}
 
 
 def check_warranty(asset_id):
     """Check warranty status. Can be called directly."""
-    asset = next((a for a in ASSETS if a["asset_id"] == asset_id), None)
+    if isinstance(asset_id, str):
+        asset_id = sys.intern(asset_id)
+    asset = index_get(_ASSETS_BY_ID, asset_id)
     if not asset:
         return make_error(
             f"Asset {asset_id} not found",
@@ -476,19 +207,17 @@ def check_warranty(asset_id):
             follow_up_tools=["lookup_asset"],
             asset_id=asset_id
         )
-    warranty = asset.get("warranty", {})
-    remaining = calculate_warranty_days(warranty.get("end_date"))
     return {
         "asset_id": asset["asset_id"], "serial_number": asset["serial_number"], "hostname": asset["hostname"],
         "manufacturer": asset["manufacturer"], "model": asset["model"],
-        "warranty": {**warranty, "remaining_days": remaining, "is_expired": remaining < 0, "expires_soon": 0 <= remaining <= 30}
+        "warranty": thaw(_get_warranty_view(asset))
     }
 
 
 def get_software_licenses(asset_id=None, customer_id=None):
     """Get software licenses. Can be called directly."""
     if asset_id:
-        asset = next((a for a in ASSETS if a["asset_id"] == asset_id), None)
+        asset = index_get(_ASSETS_BY_ID, asset_id)
         if not asset:
             return make_error(
                 f"Asset {asset_id} not found",
@@ -501,15 +230,17 @@ def get_software_licenses(asset_id=None, customer_id=None):
                 follow_up_tools=["lookup_asset"],
                 asset_id=asset_id
             )
-        licenses = asset.get("software_licenses", [])
+        licenses = thaw(asset.get("software_licenses", ()))
         return {"asset_id": asset_id, "hostname": asset["hostname"], "licenses": licenses, "total_licenses": len(licenses)}
     elif customer_id:
-        customer_assets = [a for a in ASSETS if a["customer_id"] == customer_id]
         all_licenses = []
-        for asset in customer_assets:
-            for lic in asset.get("software_licenses", []):
-                all_licenses.append({"asset_id": asset["asset_id"], "hostname": asset["hostname"], **lic})
-        return {"customer_id": customer_id, "licenses": all_licenses, "total_licenses": len(all_licenses), "total_assets_with_licenses": len([a for a in customer_assets if a.get("software_licenses")])}
+        assets_with_licenses = 0
+        for asset in index_get(_ASSETS_BY_CUSTOMER, customer_id, []):
+            licenses = asset.get("software_licenses")
+            if licenses:
+                assets_with_licenses += 1
+                all_licenses.extend({"asset_id": asset["asset_id"], "hostname": asset["hostname"], **lic} for lic in licenses)
+        return {"customer_id": customer_id, "licenses": all_licenses, "total_licenses": len(all_licenses), "total_assets_with_licenses": assets_with_licenses}
     else:
         return make_error(
             "Missing software license lookup criteria",
@@ -526,7 +257,7 @@ def get_software_licenses(asset_id=None, customer_id=None):
 
 def get_asset_history(asset_id):
     """Get asset history. Can be called directly."""
-    asset = next((a for a in ASSETS if a["asset_id"] == asset_id), None)
+    asset = index_get(_ASSETS_BY_ID, asset_id)
     if not asset:
         return make_error(
             f"Asset {asset_id} not found",
@@ -539,21 +270,30 @@ def get_asset_history(asset_id):
             follow_up_tools=["lookup_asset"],
             asset_id=asset_id
         )
-    history = []
-    history.append({"date": asset["purchase_date"], "event_type": "purchase", "description": f"Asset purchased - {asset['manufacturer']} {asset['model']}", "details": {"purchase_date": asset["purchase_date"], "location": asset["location"]}})
-    warranty = asset.get("warranty", {})
-    if warranty:
-        history.append({"date": warranty["start_date"], "event_type": "warranty_start", "description": f"Warranty coverage started - {warranty['coverage_type']}", "details": warranty})
-    if asset.get("last_maintenance"):
-        history.append({"date": asset["last_maintenance"], "event_type": "maintenance", "description": "Scheduled maintenance performed", "details": {"maintenance_date": asset["last_maintenance"]}})
-    history.sort(key=lambda x: x["date"], reverse=True)
+    history = thaw(_HISTORY_TEMPLATES[asset_id])
+    purchased = _PURCHASE_DATES[asset_id]
     return {
         "asset_id": asset["asset_id"], "serial_number": asset["serial_number"], "hostname": asset["hostname"],
         "current_status": asset["status"], "history": history, "total_events": len(history),
-        "asset_age_days": (datetime.now() - parse_date(asset["purchase_date"])).days if parse_date(asset["purchase_date"]) else 0
+        "asset_age_days": (datetime.now() - purchased).days if purchased else 0
     }
 
 
+def list_expiring_warranties(days_threshold=30):
+    """List assets whose warranty ends within days_threshold days (expired ones included). Can be called directly."""
+    today = datetime.now()
+    # remaining_days <= threshold  <=>  end_date < today + (threshold + 1) days
+    cutoff = today + timedelta(days=int(days_threshold) + 1)
+    expiring = []
+    for end_date, asset in _WARRANTY_ENDS[:bisect_left(_WARRANTY_END_DATES, cutoff)]:
+        remaining = (end_date - today).days
+        expiring.append({
+            "asset_id": asset["asset_id"], "hostname": asset["hostname"], "customer_id": asset["customer_id"],
+            "end_date": asset["warranty"]["end_date"], "remaining_days": remaining, "is_expired": remaining < 0
+        })
+    return {"days_threshold": days_threshold, "assets": expiring, "total_count": len(expiring)}
+
+
 # ============================================================================
 # MCP SERVER SETUP
 # ============================================================================
@@ -563,112 +303,243 @@ app = Server("asset-management-server")
 
 
 # Helper functions
+@lru_cache(maxsize=256)
 def parse_date(date_str):
-    """Parse date string to datetime object"""
+    """Parse date string to datetime object (memoized - the dataset reuses a small set of dates)"""
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d")
+        return datetime.fromisoformat(date_str)
     except (ValueError, TypeError):
         return None
 
 
-def calculate_warranty_days(warranty_end_date):
-    """Calculate remaining warranty days"""
+def calculate_warranty_days(warranty_end_date, today=None):
+    """Calculate remaining warranty days; pass today to share one timestamp across many assets"""
     end_date = parse_date(warranty_end_date)
     if end_date:
-        delta = end_date - datetime.now()
+        delta = end_date - (today or datetime.now())
         return delta.days
     return 0
 
 
-def search_assets(asset_id=None, serial_number=None, hostname=None, customer_id=None):
-    """Search for assets by various criteria"""
-    results = []
+# Warranty views keyed by asset_id -> (day computed, view); the figures only change once a day
+_warranty_cache = {}
+
 
-    for asset in ASSETS:
-        match = False
+def _get_warranty_view(asset):
+    """Return the warranty (read-only, shared for the day) with remaining_days, is_expired and expires_soon filled in"""
+    today = date.today()
+    cached = _warranty_cache.get(asset["asset_id"])
+    if cached and cached[0] == today:
+        return cached[1]
+    warranty = asset.get("warranty", {})
+    remaining = calculate_warranty_days(warranty.get("end_date"))
+    view = freeze({**warranty, "remaining_days": remaining, "is_expired": remaining < 0, "expires_soon": 0 <= remaining <= 30})
+    _warranty_cache[asset["asset_id"]] = (today, view)
+    return view
 
-        if asset_id and asset["asset_id"] == asset_id:
-            match = True
-        if serial_number and asset["serial_number"].lower() == serial_number.lower():
-            match = True
-        if hostname and hostname.lower() in asset["hostname"].lower():
-            match = True
-        if customer_id and asset["customer_id"] == customer_id:
-            match = True
 
-        if match or (not asset_id and not serial_number and not hostname and not customer_id):
-            results.append(asset)
+# Precompute today's warranty views so the first check_warranty call is already a cache hit
+for _asset in ASSETS:
+    _get_warranty_view(_asset)
+
+# Warranty end dates in ascending order, so fleet-wide expiry queries are a bisect instead of a scan
+_WARRANTY_ENDS = []
+for _asset in ASSETS:
+    _end_date = parse_date(_asset.get("warranty", {}).get("end_date"))
+    if _end_date:
+        _WARRANTY_ENDS.append((_end_date, _asset))
+_WARRANTY_ENDS.sort(key=lambda entry: entry[0])
+_WARRANTY_END_DATES = [end_date for end_date, _ in _WARRANTY_ENDS]
+
+
+def build_asset_history(asset):
+    """Build an asset's lifecycle events, newest first"""
+    history = []
+    history.append({"date": asset["purchase_date"], "event_type": "purchase", "description": f"Asset purchased - {asset['manufacturer']} {asset['model']}", "details": {"purchase_date": asset["purchase_date"], "location": asset["location"]}})
+    warranty = asset.get("warranty", {})
+    if warranty:
+        history.append({"date": warranty["start_date"], "event_type": "warranty_start", "description": f"Warranty coverage started - {warranty['coverage_type']}", "details": thaw(warranty)})
+    if asset.get("last_maintenance"):
+        history.append({"date": asset["last_maintenance"], "event_type": "maintenance", "description": "Scheduled maintenance performed", "details": {"maintenance_date": asset["last_maintenance"]}})
+    history.sort(key=lambda x: x["date"], reverse=True)
+    return history
+
+
+# Asset history only depends on static dates, so it is built and sorted once at import (frozen,
+# since it is shared); get_asset_history hands out a thawed copy and adds the asset age on each call
+_HISTORY_TEMPLATES = {a["asset_id"]: freeze(build_asset_history(a)) for a in ASSETS}
+_PURCHASE_DATES = {a["asset_id"]: parse_date(a["purchase_date"]) for a in ASSETS}
+
+
+def match_hostname(hostname_lower):
+    """Return positions of assets whose hostname contains hostname_lower, in dataset order"""
+    if len(hostname_lower) < 3:
+        return [i for i, host in enumerate(_COL_HOSTNAME_LOWER) if hostname_lower in host]
+    candidates = None
+    for i in range(len(hostname_lower) - 2):
+        postings = _HOST_TRIGRAMS.get(hostname_lower[i:i + 3])
+        if not postings:
+            return []
+        candidates = postings if candidates is None else candidates & postings
+    return [i for i in sorted(candidates) if hostname_lower in _COL_HOSTNAME_LOWER[i]]
+
+
+def search_asset_positions(asset_id=None, serial_number=None, hostname=None, customer_id=None):
+    """Return the ASSETS positions matching any of the given criteria, in dataset order"""
+    if isinstance(asset_id, str):
+        asset_id = sys.intern(asset_id)
+    if isinstance(customer_id, str):
+        customer_id = sys.intern(customer_id)
+    criteria = [value for value in (asset_id, serial_number, hostname, customer_id) if value]
+    if not criteria:
+        return list(range(len(ASSETS)))
+
+    # Exact identifiers come straight from the indexes; only hostname needs the column scan
+    positions = []
+    position = index_get(_ASSET_POSITIONS, asset_id) if asset_id else None
+    if position is not None:
+        positions.append(position)
+    if serial_number and serial_number.lower() in _SERIAL_POSITIONS:
+        positions.append(_SERIAL_POSITIONS[serial_number.lower()])
+    if hostname:
+        positions.extend(match_hostname(hostname.lower()))
+    if customer_id:
+        positions.extend(index_get(_CUSTOMER_POSITIONS, customer_id, []))
+
+    if len(criteria) == 1:
+        return positions
+    # Several criteria can hit the same asset; de-duplicate and keep dataset order
+    return sorted(set(positions))
+
 
-    return results
+def search_assets(asset_id=None, serial_number=None, hostname=None, customer_id=None):
+    """Search for assets by various criteria (an asset matching any criterion is returned)"""
+    return [ASSETS[i] for i in search_asset_positions(asset_id, serial_number, hostname, customer_id)]
+
+
+# check_warranty responses are static apart from three day-dependent fields, so each asset's
+# response is serialized once with placeholder slots that render_warranty fills in per call
+_WARRANTY_SLOTS = {
+    "remaining_days": "__REMAINING_DAYS__",
+    "is_expired": "__IS_EXPIRED__",
+    "expires_soon": "__EXPIRES_SOON__",
+}
+
+
+def build_warranty_template(asset_id):
+    """Serialize check_warranty's response for an asset with placeholders for the daily fields"""
+    response = check_warranty(asset_id)
+    response["warranty"] = {**response["warranty"], **_WARRANTY_SLOTS}
+    return respond(response)
+
+
+_WARRANTY_TEMPLATES = {asset_id: build_warranty_template(asset_id) for asset_id in _ASSETS_BY_ID}
+
+
+def render_warranty(asset_id):
+    """Serialized check_warranty response, filled in from the prebuilt template when one exists"""
+    template = index_get(_WARRANTY_TEMPLATES, asset_id)
+    if template is None:
+        return respond(check_warranty(asset_id))
+    view = _get_warranty_view(_ASSETS_BY_ID[asset_id])
+    for field, slot in _WARRANTY_SLOTS.items():
+        template = template.replace(f'"{slot}"', json.dumps(view[field]))
+    return template
+
+
+# Tool definitions never change, so they are built once at import and reused by list_tools
+TOOLS = [
+    Tool(
+        name="lookup_asset",
+        description="Look up detailed information about an asset by asset ID, serial number, hostname, or customer ID",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "asset_id": {"type": "string", "description": "Unique asset identifier"},
+                "serial_number": {"type": "string", "description": "Asset serial number"},
+                "hostname": {"type": "string", "description": "Asset hostname (partial match supported)"},
+                "customer_id": {"type": "string", "description": "Get all assets for a customer"}
+            }
+        }
+    ),
+    Tool(
+        name="check_warranty",
+        description="Check warranty status and coverage details for an asset",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "asset_id": {"type": "string", "description": "Unique asset identifier"}
+            },
+            "required": ["asset_id"]
+        }
+    ),
+    Tool(
+        name="get_software_licenses",
+        description="Retrieve software license information for an asset or customer",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "asset_id": {"type": "string", "description": "Asset identifier"},
+                "customer_id": {"type": "string", "description": "Customer identifier"}
+            }
+        }
+    ),
+    Tool(
+        name="get_asset_history",
+        description="Get the complete history of an asset including maintenance, transfers, and related tickets",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "asset_id": {"type": "string", "description": "Unique asset identifier"}
+            },
+            "required": ["asset_id"]
+        }
+    )
+]
 
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available asset management tools"""
-    return [
-        Tool(
-            name="lookup_asset",
-            description="Look up detailed information about an asset by asset ID, serial number, hostname, or customer ID",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "asset_id": {"type": "string", "description": "Unique asset identifier"},
-                    "serial_number": {"type": "string", "description": "Asset serial number"},
-                    "hostname": {"type": "string", "description": "Asset hostname (partial match supported)"},
-                    "customer_id": {"type": "string", "description": "Get all assets for a customer"}
-                }
-            }
-        ),
-        Tool(
-            name="check_warranty",
-            description="Check warranty status and coverage details for an asset",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "asset_id": {"type": "string", "description": "Unique asset identifier"}
-                },
-                "required": ["asset_id"]
-            }
-        ),
-        Tool(
-            name="get_software_licenses",
-            description="Retrieve software license information for an asset or customer",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "asset_id": {"type": "string", "description": "Asset identifier"},
-                    "customer_id": {"type": "string", "description": "Customer identifier"}
-                }
-            }
-        ),
-        Tool(
-            name="get_asset_history",
-            description="Get the complete history of an asset including maintenance, transfers, and related tickets",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "asset_id": {"type": "string", "description": "Unique asset identifier"}
-                },
-                "required": ["asset_id"]
-            }
-        )
-    ]
+    return TOOLS
+
+
+# Tool name -> handler taking the raw arguments dict and returning the serialized response
+TOOL_HANDLERS = {
+    "lookup_asset": lambda arguments: respond(lookup_asset(**arguments)),
+    "check_warranty": lambda arguments: render_warranty(arguments.get("asset_id")),
+    "get_software_licenses": lambda arguments: respond(get_software_licenses(**arguments)),
+    "get_asset_history": lambda arguments: respond(get_asset_history(arguments.get("asset_id"))),
+}
+
+
+def render_tool(name, arguments):
+    """Run a tool and serialize its result as TextContent text"""
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return handler(arguments)
+
+
+@lru_cache(maxsize=512)
+def render_tool_cached(name, frozen_arguments, today):
+    """Memoized render_tool; today is part of the key so cached responses expire at midnight"""
+    return render_tool(name, dict(frozen_arguments))
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls - delegates to regular Python functions"""
-    if name == "lookup_asset":
-        result = lookup_asset(**arguments)
-    elif name == "check_warranty":
-        result = check_warranty(arguments.get("asset_id"))
-    elif name == "get_software_licenses":
-        result = get_software_licenses(**arguments)
-    elif name == "get_asset_history":
-        result = get_asset_history(arguments.get("asset_id"))
+    try:
+        frozen_arguments = frozenset(arguments.items())
+    except TypeError:
+        # Unhashable argument values (e.g. lists) can't be cache keys; render them directly
+        frozen_arguments = None
+    if frozen_arguments is None:
+        text = render_tool(name, arguments)
     else:
-        raise ValueError(f"Unknown tool: {name}")
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        text = render_tool_cached(name, frozen_arguments, date.today())
+    return [TextContent(type="text", text=text)]
 
 
 
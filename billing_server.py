@@ -5,13 +5,26 @@ Provides tools for accessing billing and payment information
 
 import asyncio
 import json
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import NamedTuple, Optional
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
-def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_tools=None, **extra):
+
+def make_error(message: str, *, reason: Optional[str] = None, hints: Optional[list] = None,
+               retryable: bool = False, follow_up_tools: Optional[list] = None,
+               invoice_id: Optional[str] = None, expected_arguments: Optional[list] = None) -> dict:
     """Standardised error payload for LLM-friendly responses."""
     payload = {"error": message}
     if reason:
@@ -21,12 +34,43 @@ def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_t
     payload["retryable"] = retryable
     if follow_up_tools:
         payload["follow_up_tools"] = follow_up_tools
-    for key, value in extra.items():
-        if value is not None:
-            payload[key] = value
+    if invoice_id is not None:
+        payload["invoice_id"] = invoice_id
+    if expected_arguments is not None:
+        payload["expected_arguments"] = expected_arguments
     return payload
 
 
+# Tool responses are compact JSON by default; set MCP_PRETTY=1 to indent them for debugging
+PRETTY_JSON = os.getenv("MCP_PRETTY") == "1"
+
+
+def serialize_result(result: dict) -> str:
+    """Serialize a tool result for TextContent, using orjson when it is installed."""
+    if orjson is not None:
+        if PRETTY_JSON:
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+        return orjson.dumps(result).decode()
+    if PRETTY_JSON:
+        return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"))
+
+
+class Invoice(NamedTuple):
+    """Invoice record; responses convert it back to a dict with _asdict()"""
+    invoice_id: str
+    customer_id: str
+    ticket_id: Optional[str]
+    amount: float
+    currency: str
+    status: str
+    issue_date: str
+    due_date: str
+    paid_date: Optional[str]
+    description: str
+    line_items: list
+
+
 # Sample invoice data
 INVOICES = [
     {
@@ -259,7 +303,76 @@ INVOICES = [
     }
 ]
 
-
+# Invoice statuses; every record's status is interned to one of these so checks compare by identity
+PAID = sys.intern("paid")
+PENDING = sys.intern("pending")
+OVERDUE = sys.intern("overdue")
+
+# Store invoices as compact records: fixed fields, attribute access instead of dict lookups
+INVOICES = [Invoice(**{**row, "status": sys.intern(row["status"])}) for row in INVOICES]
+
+# Lookup indexes built once at import so tools don't rescan INVOICES on every call; read them
+# through index_get, since tool arguments may be unhashable
+_INVOICE_BY_ID = {inv.invoice_id: inv for inv in INVOICES}
+_INVOICES_BY_CUSTOMER = defaultdict(list)
+_UNPAID_BY_CUSTOMER = defaultdict(list)
+for inv in INVOICES:
+    _INVOICES_BY_CUSTOMER[inv.customer_id].append(inv)
+    if inv.status is not PAID:
+        _UNPAID_BY_CUSTOMER[inv.customer_id].append(inv)
+
+# Error payloads for each failure site, built once; not-found errors fill in the message and
+# invoice_id per call
+_ERR_INVOICE_NOT_FOUND = make_error(
+    "Invoice not found",
+    reason="The provided invoice_id does not exist in the billing dataset.",
+    hints=[
+        "Call calculate_outstanding_balance to review invoices by customer.",
+        "Use get_invoice with customer_id to browse available invoices."
+    ],
+    retryable=True,
+    follow_up_tools=["calculate_outstanding_balance", "get_invoice"]
+)
+_ERR_MISSING_INVOICE_CRITERIA = make_error(
+    "Missing invoice lookup criteria",
+    reason="Neither invoice_id nor customer_id was supplied.",
+    hints=[
+        "Provide invoice_id to retrieve a single invoice.",
+        "Provide customer_id to list all invoices for that customer."
+    ],
+    retryable=True,
+    follow_up_tools=["get_invoice"],
+    expected_arguments=["invoice_id", "customer_id"]
+)
+_ERR_PAYMENT_INVOICE_NOT_FOUND = make_error(
+    "Invoice not found",
+    reason="Payment details require a valid invoice_id.",
+    hints=[
+        "List invoices by passing customer_id to get_invoice.",
+        "Double-check the invoice_id spelling (e.g., INV-2025-001)."
+    ],
+    retryable=True,
+    follow_up_tools=["get_invoice"]
+)
+_ERR_MISSING_PAYMENT_CRITERIA = make_error(
+    "Missing payment status lookup criteria",
+    reason="No invoice_id or customer_id was provided to scope the request.",
+    hints=[
+        "Use invoice_id for a specific invoice payment status.",
+        "Use customer_id to summarise billing status across invoices."
+    ],
+    retryable=True,
+    follow_up_tools=["check_payment_status"],
+    expected_arguments=["invoice_id", "customer_id"]
+)
+
+
+def index_get(index, key, default=None):
+    """index.get(key, default), treating unhashable keys (e.g. lists) as no match"""
+    try:
+        return index.get(key, default)
+    except TypeError:
+        return default
 
 
 # ============================================================================
@@ -269,122 +382,111 @@ INVOICES = [
 def get_invoice(invoice_id=None, customer_id=None):
     """Get invoice(s) by ID or customer ID. Can be called directly."""
     if invoice_id:
-        invoice = next((inv for inv in INVOICES if inv["invoice_id"] == invoice_id), None)
+        invoice = index_get(_INVOICE_BY_ID, invoice_id)
         if not invoice:
-            return make_error(
-                f"Invoice {invoice_id} not found",
-                reason="The provided invoice_id does not exist in the billing dataset.",
-                hints=[
-                    "Call calculate_outstanding_balance to review invoices by customer.",
-                    "Use get_invoice with customer_id to browse available invoices."
-                ],
-                retryable=True,
-                follow_up_tools=["calculate_outstanding_balance", "get_invoice"],
-                invoice_id=invoice_id
-            )
-        result = invoice.copy()
-        result["is_overdue"] = is_overdue(invoice)
-        result["days_overdue"] = calculate_days_overdue(invoice)
-        return result
+            return {**_ERR_INVOICE_NOT_FOUND, "error": f"Invoice {invoice_id} not found", "invoice_id": invoice_id}
+        now = datetime.now()
+        return {**invoice._asdict(), "is_overdue": is_overdue(invoice, now), "days_overdue": calculate_days_overdue(invoice, now)}
     elif customer_id:
-        customer_invoices = [inv for inv in INVOICES if inv["customer_id"] == customer_id]
+        customer_invoices = [inv._asdict() for inv in index_get(_INVOICES_BY_CUSTOMER, customer_id, [])]
         return {"customer_id": customer_id, "invoices": customer_invoices, "total_invoices": len(customer_invoices)}
     else:
-        return make_error(
-            "Missing invoice lookup criteria",
-            reason="Neither invoice_id nor customer_id was supplied.",
-            hints=[
-                "Provide invoice_id to retrieve a single invoice.",
-                "Provide customer_id to list all invoices for that customer."
-            ],
-            retryable=True,
-            follow_up_tools=["get_invoice"],
-            expected_arguments=["invoice_id", "customer_id"]
-        )
+        return {**_ERR_MISSING_INVOICE_CRITERIA}
 
 
-def check_payment_status(invoice_id=None, customer_id=None):
-    """Check payment status of invoice(s). Can be called directly."""
+def check_payment_status(invoice_id=None, customer_id=None, include_overdue_details=True):
+    """Check payment status of invoice(s). Can be called directly.
+
+    For customer lookups, include_overdue_details=False returns only the summary counts
+    (the overdue_invoices key is omitted).
+    """
     if invoice_id:
-        invoice = next((inv for inv in INVOICES if inv["invoice_id"] == invoice_id), None)
+        invoice = index_get(_INVOICE_BY_ID, invoice_id)
         if not invoice:
-            return make_error(
-                f"Invoice {invoice_id} not found",
-                reason="Payment details require a valid invoice_id.",
-                hints=[
-                    "List invoices by passing customer_id to get_invoice.",
-                    "Double-check the invoice_id spelling (e.g., INV-2025-001)."
-                ],
-                retryable=True,
-                follow_up_tools=["get_invoice"],
-                invoice_id=invoice_id
-            )
+            return {**_ERR_PAYMENT_INVOICE_NOT_FOUND, "error": f"Invoice {invoice_id} not found", "invoice_id": invoice_id}
+        now = datetime.now()
         return {
-            "invoice_id": invoice["invoice_id"], "customer_id": invoice["customer_id"],
-            "payment_status": invoice["status"], "amount": invoice["amount"], "currency": invoice["currency"],
-            "issue_date": invoice["issue_date"], "due_date": invoice["due_date"], "paid_date": invoice["paid_date"],
-            "is_overdue": is_overdue(invoice), "days_overdue": calculate_days_overdue(invoice)
+            "invoice_id": invoice.invoice_id, "customer_id": invoice.customer_id,
+            "payment_status": invoice.status, "amount": invoice.amount, "currency": invoice.currency,
+            "issue_date": invoice.issue_date, "due_date": invoice.due_date, "paid_date": invoice.paid_date,
+            "is_overdue": is_overdue(invoice, now), "days_overdue": calculate_days_overdue(invoice, now)
         }
     elif customer_id:
-        customer_invoices = [inv for inv in INVOICES if inv["customer_id"] == customer_id]
-        pending = [inv for inv in customer_invoices if inv["status"] == "pending"]
-        overdue = [inv for inv in customer_invoices if inv["status"] == "overdue" or is_overdue(inv)]
-        paid = [inv for inv in customer_invoices if inv["status"] == "paid"]
-        return {
+        customer_invoices = index_get(_INVOICES_BY_CUSTOMER, customer_id, [])
+        # One pass: each unpaid invoice's due date is parsed once and compared against a single "now"
+        now = datetime.now()
+        today = now.date().isoformat()
+        paid = pending = overdue = 0
+        overdue_invoices = []
+        for inv in customer_invoices:
+            status = inv.status
+            if status is PAID:
+                paid += 1
+                continue
+            if status is PENDING:
+                pending += 1
+            # ISO dates order correctly as strings: a due date after today cannot be overdue
+            if status is not OVERDUE and inv.due_date > today:
+                continue
+            due = _DUE_DATES[inv.invoice_id]
+            if status is OVERDUE or (due and now > due):
+                overdue += 1
+                if include_overdue_details:
+                    days = max(0, (now - due).days) if due else 0
+                    overdue_invoices.append({"invoice_id": inv.invoice_id, "amount": inv.amount, "due_date": inv.due_date, "days_overdue": days})
+        result = {
             "customer_id": customer_id,
-            "summary": {"total_invoices": len(customer_invoices), "paid": len(paid), "pending": len(pending), "overdue": len(overdue)},
-            "overdue_invoices": [{"invoice_id": inv["invoice_id"], "amount": inv["amount"], "due_date": inv["due_date"], "days_overdue": calculate_days_overdue(inv)} for inv in overdue]
+            "summary": {"total_invoices": len(customer_invoices), "paid": paid, "pending": pending, "overdue": overdue}
         }
+        if include_overdue_details:
+            result["overdue_invoices"] = overdue_invoices
+        return result
     else:
-        return make_error(
-            "Missing payment status lookup criteria",
-            reason="No invoice_id or customer_id was provided to scope the request.",
-            hints=[
-                "Use invoice_id for a specific invoice payment status.",
-                "Use customer_id to summarise billing status across invoices."
-            ],
-            retryable=True,
-            follow_up_tools=["check_payment_status"],
-            expected_arguments=["invoice_id", "customer_id"]
-        )
+        return {**_ERR_MISSING_PAYMENT_CRITERIA}
 
 
 def get_billing_history(customer_id, start_date=None, end_date=None):
     """Get billing history for a customer. Can be called directly."""
-    customer_invoices = [inv for inv in INVOICES if inv["customer_id"] == customer_id]
+    customer_invoices = index_get(_INVOICES_BY_CUSTOMER, customer_id, [])
     if start_date or end_date:
-        filtered = []
-        for inv in customer_invoices:
-            inv_date = parse_date(inv["issue_date"])
-            if not inv_date:
-                continue
-            if start_date and inv_date < parse_date(start_date):
-                continue
-            if end_date and inv_date > parse_date(end_date):
-                continue
-            filtered.append(inv)
-        customer_invoices = filtered
-    total_billed = sum(inv["amount"] for inv in customer_invoices)
-    total_paid = sum(inv["amount"] for inv in customer_invoices if inv["status"] == "paid")
-    total_pending = sum(inv["amount"] for inv in customer_invoices if inv["status"] in ["pending", "overdue"])
+        # Bisect the customer's issue-date-ordered invoices, then restore dataset order
+        issue_dates = index_get(_HISTORY_ISSUE_DATES, customer_id, [])
+        lo = bisect_left(issue_dates, parse_date(start_date)) if start_date else 0
+        hi = bisect_right(issue_dates, parse_date(end_date)) if end_date else len(issue_dates)
+        window = index_get(_HISTORY_BY_CUSTOMER, customer_id, [])[lo:hi]
+        customer_invoices = sorted(window, key=lambda inv: _INVOICE_POSITIONS[inv.invoice_id])
+        total_billed, total_paid, total_pending = total_amounts(customer_invoices)
+    else:
+        total_billed, total_paid, total_pending = index_get(_CUSTOMER_TOTALS, customer_id, (0, 0, 0))
     return {
         "customer_id": customer_id, "start_date": start_date, "end_date": end_date,
-        "invoices": customer_invoices,
+        "invoices": [inv._asdict() for inv in customer_invoices],
         "summary": {"total_invoices": len(customer_invoices), "total_billed": total_billed, "total_paid": total_paid, "total_pending": total_pending, "currency": "USD"}
     }
 
 
 def calculate_outstanding_balance(customer_id):
     """Calculate outstanding balance for a customer. Can be called directly."""
-    customer_invoices = [inv for inv in INVOICES if inv["customer_id"] == customer_id]
-    unpaid = [inv for inv in customer_invoices if inv["status"] != "paid"]
-    overdue = [inv for inv in unpaid if is_overdue(inv)]
-    outstanding_balance = sum(inv["amount"] for inv in unpaid)
-    overdue_amount = sum(inv["amount"] for inv in overdue)
+    # The balance itself is precomputed; only the overdue split depends on today's date.
+    # Each unpaid invoice's due date is compared once against a single "now"
+    now = datetime.now()
+    today = now.date().isoformat()
+    overdue_amount = 0
+    overdue_count = 0
+    unpaid_invoices = []
+    for inv in index_get(_UNPAID_BY_CUSTOMER, customer_id, []):
+        # ISO dates order correctly as strings: a due date after today cannot be overdue
+        due = None if inv.due_date > today else _DUE_DATES[inv.invoice_id]
+        overdue = bool(due) and now > due
+        days = max(0, (now - due).days) if overdue else 0
+        if overdue:
+            overdue_amount += inv.amount
+            overdue_count += 1
+        unpaid_invoices.append({"invoice_id": inv.invoice_id, "amount": inv.amount, "status": inv.status, "due_date": inv.due_date, "is_overdue": overdue, "days_overdue": days})
     return {
-        "customer_id": customer_id, "outstanding_balance": outstanding_balance, "currency": "USD",
-        "overdue_amount": overdue_amount, "number_of_unpaid_invoices": len(unpaid), "number_of_overdue_invoices": len(overdue),
-        "unpaid_invoices": [{"invoice_id": inv["invoice_id"], "amount": inv["amount"], "status": inv["status"], "due_date": inv["due_date"], "is_overdue": is_overdue(inv), "days_overdue": calculate_days_overdue(inv)} for inv in unpaid]
+        "customer_id": customer_id, "outstanding_balance": index_get(_OUTSTANDING_BALANCES, customer_id, 0), "currency": "USD",
+        "overdue_amount": overdue_amount, "number_of_unpaid_invoices": len(unpaid_invoices), "number_of_overdue_invoices": overdue_count,
+        "unpaid_invoices": unpaid_invoices
     }
 
 
@@ -397,102 +499,154 @@ app = Server("billing-server")
 
 
 # Helper functions
-def parse_date(date_str):
-    """Parse date string to datetime object"""
+@lru_cache(maxsize=1024)
+def parse_date(date_str: Optional[str]) -> Optional[datetime]:
+    """Parse date string to datetime object (cached; invoices reuse a small set of dates)"""
     try:
         return datetime.strptime(date_str, "%Y-%m-%d")
     except (ValueError, TypeError):
         return None
 
 
-def is_overdue(invoice):
-    """Check if invoice is overdue"""
-    if invoice["status"] == "paid":
+# Invoice dates never change, so they are parsed once at import; keyed by invoice_id so the
+# invoice records keep exactly the fields returned to clients
+_DUE_DATES = {inv.invoice_id: parse_date(inv.due_date) for inv in INVOICES}
+_ISSUE_DATES = {inv.invoice_id: parse_date(inv.issue_date) for inv in INVOICES}
+
+# Dataset position of each invoice, so filtered history keeps its original order
+_INVOICE_POSITIONS = {inv.invoice_id: position for position, inv in enumerate(INVOICES)}
+
+# Each customer's dated invoices in issue-date order, with the parallel list of dates, so
+# date-range history queries are a bisect instead of a scan
+_HISTORY_BY_CUSTOMER = {
+    customer_id: sorted((inv for inv in invoices if _ISSUE_DATES[inv.invoice_id]),
+                        key=lambda inv: _ISSUE_DATES[inv.invoice_id])
+    for customer_id, invoices in _INVOICES_BY_CUSTOMER.items()
+}
+_HISTORY_ISSUE_DATES = {
+    customer_id: [_ISSUE_DATES[inv.invoice_id] for inv in invoices]
+    for customer_id, invoices in _HISTORY_BY_CUSTOMER.items()
+}
+
+
+def total_amounts(invoices):
+    """Sum billed, paid and pending (pending or overdue) amounts over invoices in one pass"""
+    billed = paid = pending = 0
+    for inv in invoices:
+        billed += inv.amount
+        status = inv.status
+        if status is PAID:
+            paid += inv.amount
+        elif status is PENDING or status is OVERDUE:
+            pending += inv.amount
+    return billed, paid, pending
+
+
+# Per-customer aggregates (the GROUP BY customer_id sums) computed once at import, since
+# invoice amounts and statuses never change
+_CUSTOMER_TOTALS = {customer_id: total_amounts(invoices) for customer_id, invoices in _INVOICES_BY_CUSTOMER.items()}
+_OUTSTANDING_BALANCES = {customer_id: sum(inv.amount for inv in invoices) for customer_id, invoices in _UNPAID_BY_CUSTOMER.items()}
+
+
+def is_overdue(invoice: Invoice, now: Optional[datetime] = None) -> bool:
+    """Check if invoice is overdue; pass now to share one clock reading across a request"""
+    if invoice.status is PAID:
         return False
-    due_date = parse_date(invoice["due_date"])
+    due_date = _DUE_DATES[invoice.invoice_id]
     if due_date:
-        return datetime.now() > due_date
+        return (now or datetime.now()) > due_date
     return False
 
 
-def calculate_days_overdue(invoice):
+def calculate_days_overdue(invoice: Invoice, now: Optional[datetime] = None) -> int:
     """Calculate how many days an invoice is overdue"""
-    if invoice["status"] == "paid":
+    if invoice.status is PAID:
         return 0
-    due_date = parse_date(invoice["due_date"])
+    due_date = _DUE_DATES[invoice.invoice_id]
     if due_date:
-        delta = datetime.now() - due_date
+        delta = (now or datetime.now()) - due_date
         return max(0, delta.days)
     return 0
 
 
+# Tool definitions never change, so they are built once at import and reused by list_tools
+TOOLS = [
+    Tool(
+        name="get_invoice",
+        description="Retrieve invoice details by invoice ID or search by customer ID",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "invoice_id": {"type": "string", "description": "Unique invoice identifier"},
+                "customer_id": {"type": "string", "description": "Get all invoices for a customer"}
+            }
+        }
+    ),
+    Tool(
+        name="check_payment_status",
+        description="Check the payment status of an invoice or customer account",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "invoice_id": {"type": "string", "description": "Invoice identifier"},
+                "customer_id": {"type": "string", "description": "Customer identifier"},
+                "include_overdue_details": {"type": "boolean", "description": "For customer lookups, list each overdue invoice (default true); set false for summary counts only (overdue_invoices is then omitted)"}
+            }
+        }
+    ),
+    Tool(
+        name="get_billing_history",
+        description="Retrieve billing history for a customer over a specified time period",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "customer_id": {"type": "string", "description": "Unique customer identifier"},
+                "start_date": {"type": "string", "description": "Start date for history (YYYY-MM-DD)"},
+                "end_date": {"type": "string", "description": "End date for history (YYYY-MM-DD)"}
+            },
+            "required": ["customer_id"]
+        }
+    ),
+    Tool(
+        name="calculate_outstanding_balance",
+        description="Calculate the total outstanding balance for a customer account",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "customer_id": {"type": "string", "description": "Unique customer identifier"}
+            },
+            "required": ["customer_id"]
+        }
+    )
+]
+
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available billing tools"""
-    return [
-        Tool(
-            name="get_invoice",
-            description="Retrieve invoice details by invoice ID or search by customer ID",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "invoice_id": {"type": "string", "description": "Unique invoice identifier"},
-                    "customer_id": {"type": "string", "description": "Get all invoices for a customer"}
-                }
-            }
-        ),
-        Tool(
-            name="check_payment_status",
-            description="Check the payment status of an invoice or customer account",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "invoice_id": {"type": "string", "description": "Invoice identifier"},
-                    "customer_id": {"type": "string", "description": "Customer identifier"}
-                }
-            }
-        ),
-        Tool(
-            name="get_billing_history",
-            description="Retrieve billing history for a customer over a specified time period",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "customer_id": {"type": "string", "description": "Unique customer identifier"},
-                    "start_date": {"type": "string", "description": "Start date for history (YYYY-MM-DD)"},
-                    "end_date": {"type": "string", "description": "End date for history (YYYY-MM-DD)"}
-                },
-                "required": ["customer_id"]
-            }
-        ),
-        Tool(
-            name="calculate_outstanding_balance",
-            description="Calculate the total outstanding balance for a customer account",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "customer_id": {"type": "string", "description": "Unique customer identifier"}
-                },
-                "required": ["customer_id"]
-            }
-        )
-    ]
+    return TOOLS
+
+
+# Tool name -> handler over the arguments dict; missing arguments fall back to the function defaults
+# and unknown ones are ignored, so bad calls get the tools' structured errors rather than a TypeError
+TOOL_HANDLERS = {
+    "get_invoice": lambda arguments: get_invoice(arguments.get("invoice_id"), arguments.get("customer_id")),
+    "check_payment_status": lambda arguments: check_payment_status(
+        arguments.get("invoice_id"), arguments.get("customer_id"), arguments.get("include_overdue_details", True)),
+    "get_billing_history": lambda arguments: get_billing_history(
+        arguments.get("customer_id"), arguments.get("start_date"), arguments.get("end_date")),
+    "calculate_outstanding_balance": lambda arguments: calculate_outstanding_balance(arguments.get("customer_id")),
+}
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls - delegates to regular Python functions"""
-    if name == "get_invoice":
-        result = get_invoice(**arguments)
-    elif name == "check_payment_status":
-        result = check_payment_status(**arguments)
-    elif name == "get_billing_history":
-        result = get_billing_history(**arguments)
-    elif name == "calculate_outstanding_balance":
-        result = calculate_outstanding_balance(arguments.get("customer_id"))
-    else:
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    result = handler(arguments)
+    return [TextContent(type="text", text=serialize_result(result))]
 
 
 
@@ -507,4 +661,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:  # uvloop is optional (and unavailable on Windows); use the default loop
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -5,12 +5,21 @@ Provides tools for accessing customer information and account details
 
 import asyncio
 import json
+import sys
+from functools import lru_cache
+from typing import NamedTuple
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
-def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_tools=None, **extra):
+
+def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_tools=None,
+               customer_id=None, search_criteria=None):
     """
     Create a structured error payload that is easy for LLMs to act on while
     remaining backwards-compatible with existing callers.
@@ -23,12 +32,40 @@ def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_t
     payload["retryable"] = retryable
     if follow_up_tools:
         payload["follow_up_tools"] = follow_up_tools
-    for key, value in extra.items():
-        if value is not None:
-            payload[key] = value
+    if customer_id is not None:
+        payload["customer_id"] = customer_id
+    if search_criteria is not None:
+        payload["search_criteria"] = search_criteria
     return payload
 
 
+# Long-lived stdlib encoder for the fallback path, so each call skips building a JSONEncoder.
+# Non-ASCII text is written as-is, matching orjson's output.
+_ENCODE_JSON = json.JSONEncoder(indent=2, ensure_ascii=False).encode
+
+
+def serialize_result(result):
+    """Serialize a tool result for TextContent, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+    return _ENCODE_JSON(result)
+
+
+class Customer(NamedTuple):
+    """Customer record; responses convert it back to a dict with _asdict()"""
+    customer_id: str
+    company_name: str
+    email: str
+    phone: str
+    tier: str
+    status: str
+    account_manager: str
+    created_date: str
+    last_activity: str
+    sla_terms: dict
+    contacts: list
+
+
 # Sample customer data
 CUSTOMERS = [
     {
@@ -215,7 +252,58 @@ CUSTOMERS = [
     }
 ]
 
-
+# Store customers as compact records: fixed fields, attribute access instead of dict lookups
+CUSTOMERS = [Customer(**row) for row in CUSTOMERS]
+
+# Lookup indexes built once at import so searches don't rescan CUSTOMERS on every call.
+# They map to positions so search_customer can keep returning the first match in dataset order.
+_CUSTOMER_POSITIONS = {}
+_EMAIL_POSITIONS = {}
+for _position, _customer in enumerate(CUSTOMERS):
+    _CUSTOMER_POSITIONS.setdefault(_customer.customer_id, _position)
+    _EMAIL_POSITIONS.setdefault(_customer.email.lower(), _position)
+
+# Lower-cased company names, so partial company searches don't re-lowercase every customer per call
+_COMPANY_NAMES_LOWER = tuple(c.company_name.lower() for c in CUSTOMERS)
+
+# Fields returned by each customer_id-based tool, and the error each returns for an unknown
+# customer_id (the message and customer_id are filled in per call)
+_PROJECTIONS = {
+    "status": ("customer_id", "company_name", "status", "tier", "account_manager", "last_activity", "created_date"),
+    "sla": ("customer_id", "company_name", "tier", "sla_terms"),
+    "contacts": ("customer_id", "company_name", "contacts"),
+}
+_NOT_FOUND_ERRORS = {
+    "status": make_error(
+        "Customer not found",
+        reason="The requested customer_id is not present in the sample dataset.",
+        hints=[
+            "Call lookup_customer with company_name or email to rediscover the customer_id.",
+            "Use list_customer_contacts to retrieve contacts once a valid customer is identified."
+        ],
+        retryable=True,
+        follow_up_tools=["lookup_customer"]
+    ),
+    "sla": make_error(
+        "Customer not found",
+        reason="SLA information is only available for known customers.",
+        hints=[
+            "Call lookup_customer first to confirm the customer_id.",
+            "If the customer is new, add it to the CUSTOMERS dataset before retrying."
+        ],
+        retryable=True,
+        follow_up_tools=["lookup_customer"]
+    ),
+    "contacts": make_error(
+        "Customer not found",
+        reason="Contacts can only be listed for customers that exist in the dataset.",
+        hints=[
+            "Run lookup_customer to confirm the customer_id or discover alternatives."
+        ],
+        retryable=True,
+        follow_up_tools=["lookup_customer"]
+    ),
+}
 
 
 # ============================================================================
@@ -238,6 +326,15 @@ def lookup_customer(customer_id=None, email=None, company_name=None):
     Returns:
         dict: Customer information or error dict
     """
+    try:
+        return dict(_lookup_customer(customer_id, email, company_name))
+    except TypeError:
+        # Unhashable arguments (e.g. lists) can't be cache keys; build the response directly
+        return dict(_build_lookup(customer_id, email, company_name))
+
+
+def _build_lookup(customer_id, email, company_name):
+    """Build the lookup_customer response or its not-found error"""
     customer = search_customer(customer_id=customer_id, email=email, company_name=company_name)
     
     if not customer:
@@ -252,7 +349,41 @@ def lookup_customer(customer_id=None, email=None, company_name=None):
             follow_up_tools=["lookup_customer"],
             search_criteria={k: v for k, v in {"customer_id": customer_id, "email": email, "company_name": company_name}.items() if v}
         )
-    return customer.copy()
+    return customer._asdict()
+
+
+@lru_cache(maxsize=256)
+def _lookup_customer(customer_id, email, company_name):
+    """Memoized _build_lookup; CUSTOMERS never changes, so callers get a copy"""
+    return _build_lookup(customer_id, email, company_name)
+
+
+def _build_projection(customer_id, kind):
+    """Build a customer_id tool response (one of _PROJECTIONS) or its not-found error"""
+    customer = search_customer(customer_id=customer_id)
+    if not customer:
+        payload = {**_NOT_FOUND_ERRORS[kind], "error": f"Customer {customer_id} not found"}
+        if customer_id is not None:
+            payload["customer_id"] = customer_id
+        return payload
+    result = {field: getattr(customer, field) for field in _PROJECTIONS[kind]}
+    if kind == "contacts":
+        result["total_contacts"] = len(customer.contacts)
+    return result
+
+
+@lru_cache(maxsize=256)
+def _project(customer_id, kind):
+    """Memoized _build_projection"""
+    return _build_projection(customer_id, kind)
+
+
+def project(customer_id, kind):
+    """Copy of a customer_id tool response; unhashable IDs (e.g. lists) bypass the cache"""
+    try:
+        return dict(_project(customer_id, kind))
+    except TypeError:
+        return dict(_build_projection(customer_id, kind))
 
 
 def check_customer_status(customer_id):
@@ -269,29 +400,7 @@ def check_customer_status(customer_id):
     Returns:
         dict: Customer status information or error dict
     """
-    customer = search_customer(customer_id=customer_id)
-    
-    if not customer:
-        return make_error(
-            f"Customer {customer_id} not found",
-            reason="The requested customer_id is not present in the sample dataset.",
-            hints=[
-                "Call lookup_customer with company_name or email to rediscover the customer_id.",
-                "Use list_customer_contacts to retrieve contacts once a valid customer is identified."
-            ],
-            retryable=True,
-            follow_up_tools=["lookup_customer"],
-            customer_id=customer_id
-        )
-    return {
-        "customer_id": customer["customer_id"],
-        "company_name": customer["company_name"],
-        "status": customer["status"],
-        "tier": customer["tier"],
-        "account_manager": customer["account_manager"],
-        "last_activity": customer["last_activity"],
-        "created_date": customer["created_date"]
-    }
+    return project(customer_id, "status")
 
 
 def get_sla_terms(customer_id):
@@ -308,26 +417,7 @@ def get_sla_terms(customer_id):
     Returns:
         dict: SLA terms or error dict
     """
-    customer = search_customer(customer_id=customer_id)
-    
-    if not customer:
-        return make_error(
-            f"Customer {customer_id} not found",
-            reason="SLA information is only available for known customers.",
-            hints=[
-                "Call lookup_customer first to confirm the customer_id.",
-                "If the customer is new, add it to the CUSTOMERS dataset before retrying."
-            ],
-            retryable=True,
-            follow_up_tools=["lookup_customer"],
-            customer_id=customer_id
-        )
-    return {
-        "customer_id": customer["customer_id"],
-        "company_name": customer["company_name"],
-        "tier": customer["tier"],
-        "sla_terms": customer["sla_terms"]
-    }
+    return project(customer_id, "sla")
 
 
 def list_customer_contacts(customer_id):
@@ -344,24 +434,32 @@ def list_customer_contacts(customer_id):
     Returns:
         dict: List of contacts or error dict
     """
-    customer = search_customer(customer_id=customer_id)
-    
-    if not customer:
-        return make_error(
-            f"Customer {customer_id} not found",
-            reason="Contacts can only be listed for customers that exist in the dataset.",
-            hints=[
-                "Run lookup_customer to confirm the customer_id or discover alternatives."
-            ],
-            retryable=True,
-            follow_up_tools=["lookup_customer"],
-            customer_id=customer_id
-        )
+    return project(customer_id, "contacts")
+
+
+def _cache_clear():
+    """Reset the memoized customer responses"""
+    for builder in (_lookup_customer, _project):
+        builder.cache_clear()
+    render_tool_cached.cache_clear()
+
+
+def layer_stats(*cached_functions):
+    """Combined hit/miss counts for memoized functions that form one cache layer"""
+    hits = misses = 0
+    for cached in cached_functions:
+        info = cached.cache_info()
+        hits += info.hits
+        misses += info.misses
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": hits / total if total else 0.0}
+
+
+def get_cache_stats():
+    """Hit/miss counts per cache layer (rendered text, then the response builders). Can be called directly."""
     return {
-        "customer_id": customer["customer_id"],
-        "company_name": customer["company_name"],
-        "contacts": customer["contacts"],
-        "total_contacts": len(customer["contacts"])
+        "rendered": layer_stats(render_tool_cached),
+        "responses": layer_stats(_lookup_customer, _project),
     }
 
 
@@ -374,92 +472,155 @@ app = Server("customer-database-server")
 
 
 # Helper functions
+def customer_position(customer_id):
+    """Position of the customer with this ID in CUSTOMERS, or None (unhashable IDs match nothing)"""
+    try:
+        return _CUSTOMER_POSITIONS.get(customer_id)
+    except TypeError:
+        return None
+
+
 def search_customer(customer_id=None, email=None, company_name=None):
-    """Search for a customer by various criteria"""
-    for customer in CUSTOMERS:
-        if customer_id and customer["customer_id"] == customer_id:
-            return customer
-        if email and customer["email"].lower() == email.lower():
-            return customer
-        if company_name and company_name.lower() in customer["company_name"].lower():
-            return customer
-    return None
+    """Search for a customer by various criteria; the first customer matching any of them wins"""
+    # Single-criterion fast paths (the common case): no position comparisons needed
+    if not email and not company_name:
+        position = customer_position(customer_id) if customer_id else None
+        return CUSTOMERS[position] if position is not None else None
+    if not customer_id and not company_name:
+        position = _EMAIL_POSITIONS.get(email.lower())
+        return CUSTOMERS[position] if position is not None else None
+    if not customer_id and not email:
+        query = company_name.lower()
+        return next((CUSTOMERS[position] for position, name in enumerate(_COMPANY_NAMES_LOWER) if query in name), None)
+
+    best = len(CUSTOMERS)
+    if customer_id:
+        position = customer_position(customer_id)
+        if position is not None:
+            best = min(best, position)
+    if email:
+        best = min(best, _EMAIL_POSITIONS.get(email.lower(), best))
+    if company_name:
+        # Partial company matches still need a scan, but only over customers ahead of any exact hit
+        query = company_name.lower()
+        for position in range(best):
+            if query in _COMPANY_NAMES_LOWER[position]:
+                best = position
+                break
+    return CUSTOMERS[best] if best < len(CUSTOMERS) else None
+
+
+# Tool definitions never change, so they are built once at import and reused by list_tools
+TOOLS = [
+    Tool(
+        name="lookup_customer",
+        description="Look up customer information by customer ID, email, or company name",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "customer_id": {"type": "string", "description": "Unique customer identifier"},
+                "email": {"type": "string", "description": "Customer email address"},
+                "company_name": {"type": "string", "description": "Company name (partial match supported)"}
+            }
+        }
+    ),
+    Tool(
+        name="check_customer_status",
+        description="Check the current status of a customer account (active, suspended, etc.)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "customer_id": {"type": "string", "description": "Unique customer identifier"}
+            },
+            "required": ["customer_id"]
+        }
+    ),
+    Tool(
+        name="get_sla_terms",
+        description="Retrieve Service Level Agreement terms and conditions for a customer",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "customer_id": {"type": "string", "description": "Unique customer identifier"}
+            },
+            "required": ["customer_id"]
+        }
+    ),
+    Tool(
+        name="list_customer_contacts",
+        description="Get a list of all contacts associated with a customer account",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "customer_id": {"type": "string", "description": "Unique customer identifier"}
+            },
+            "required": ["customer_id"]
+        }
+    )
+]
 
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available customer database tools"""
-    return [
-        Tool(
-            name="lookup_customer",
-            description="Look up customer information by customer ID, email, or company name",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "customer_id": {"type": "string", "description": "Unique customer identifier"},
-                    "email": {"type": "string", "description": "Customer email address"},
-                    "company_name": {"type": "string", "description": "Company name (partial match supported)"}
-                }
-            }
-        ),
-        Tool(
-            name="check_customer_status",
-            description="Check the current status of a customer account (active, suspended, etc.)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "customer_id": {"type": "string", "description": "Unique customer identifier"}
-                },
-                "required": ["customer_id"]
-            }
-        ),
-        Tool(
-            name="get_sla_terms",
-            description="Retrieve Service Level Agreement terms and conditions for a customer",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "customer_id": {"type": "string", "description": "Unique customer identifier"}
-                },
-                "required": ["customer_id"]
-            }
-        ),
-        Tool(
-            name="list_customer_contacts",
-            description="Get a list of all contacts associated with a customer account",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "customer_id": {"type": "string", "description": "Unique customer identifier"}
-                },
-                "required": ["customer_id"]
-            }
-        )
-    ]
+    return TOOLS
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-    """Handle tool calls - delegates to regular Python functions"""
+# Tool name -> handler taking the raw arguments dict and returning the result dict
+TOOL_HANDLERS = {
+    "lookup_customer": lambda arguments: lookup_customer(**arguments),
+    "check_customer_status": lambda arguments: check_customer_status(arguments.get("customer_id")),
+    "get_sla_terms": lambda arguments: get_sla_terms(arguments.get("customer_id")),
+    "list_customer_contacts": lambda arguments: list_customer_contacts(arguments.get("customer_id")),
+}
+
 
-    if name == "lookup_customer":
-        result = lookup_customer(**arguments)
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+def render_tool(name, arguments):
+    """Run a tool and serialize its result as TextContent text"""
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return serialize_result(handler(arguments))
+
+
+@lru_cache(maxsize=512)
+def render_tool_cached(name, frozen_arguments):
+    """Memoized render_tool; responses only depend on the static CUSTOMERS data"""
+    return render_tool(name, dict(frozen_arguments))
+
+
+# Tool calls between cache summaries on stderr (stdout carries the MCP protocol)
+CACHE_STATS_INTERVAL = 100
+_tool_calls = 0
 
-    elif name == "check_customer_status":
-        result = check_customer_status(arguments.get("customer_id"))
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
-    elif name == "get_sla_terms":
-        result = get_sla_terms(arguments.get("customer_id"))
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+def log_cache_stats():
+    """Write a one-line cache summary to stderr"""
+    summary = " ".join(f"{layer}: hits={stats['hits']} misses={stats['misses']} hit_ratio={stats['hit_ratio']:.1%}"
+                       for layer, stats in get_cache_stats().items())
+    print(f"[customer-database-server] cache {summary}", file=sys.stderr)
 
-    elif name == "list_customer_contacts":
-        result = list_customer_contacts(arguments.get("customer_id"))
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
+@app.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    """Handle tool calls - delegates to regular Python functions"""
+    global _tool_calls
+    _tool_calls += 1
+    if _tool_calls % CACHE_STATS_INTERVAL == 0:
+        log_cache_stats()
+    try:
+        frozen_arguments = frozenset(arguments.items())
+    except TypeError:
+        # Unhashable argument values (e.g. lists) can't be cache keys; render them directly
+        frozen_arguments = None
+    # Lookups and serialization are synchronous; run them in the default thread pool so
+    # concurrent requests don't queue up behind each other on the event loop
+    loop = asyncio.get_running_loop()
+    if frozen_arguments is None:
+        text = await loop.run_in_executor(None, render_tool, name, arguments)
     else:
-        raise ValueError(f"Unknown tool: {name}")
+        text = await loop.run_in_executor(None, render_tool_cached, name, frozen_arguments)
+    return [TextContent(type="text", text=text)]
 
 
 
@@ -474,4 +635,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:  # uvloop is optional (and unavailable on Windows); use the default loop
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
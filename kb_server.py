@@ -4,13 +4,24 @@ Provides tools for searching and accessing knowledge base articles and solutions
 """
 
 import asyncio
+import heapq
 import json
+import os
+import sys
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
-def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_tools=None, **extra):
+
+def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_tools=None, article_id=None):
     """Return a structured error payload for LLM consumption."""
     payload = {"error": message}
     if reason:
@@ -20,12 +31,31 @@ def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_t
     payload["retryable"] = retryable
     if follow_up_tools:
         payload["follow_up_tools"] = follow_up_tools
-    for key, value in extra.items():
-        if value is not None:
-            payload[key] = value
+    if article_id is not None:
+        payload["article_id"] = article_id
     return payload
 
 
+# Tool responses are compact JSON by default; set MCP_PRETTY=1 to indent them for debugging
+PRETTY_JSON = os.getenv("MCP_PRETTY") == "1"
+
+# Long-lived stdlib encoder for the fallback path, so each call skips building a JSONEncoder.
+# Non-ASCII text is written as-is, matching orjson's output.
+if PRETTY_JSON:
+    _ENCODE_JSON = json.JSONEncoder(indent=2, ensure_ascii=False).encode
+else:
+    _ENCODE_JSON = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+def serialize_result(result):
+    """Serialize a tool result for TextContent, using orjson when it is installed."""
+    if orjson is not None:
+        if PRETTY_JSON:
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+        return orjson.dumps(result).decode()
+    return _ENCODE_JSON(result)
+
+
 # Sample knowledge base articles
 KB_ARTICLES = [
     {
@@ -496,7 +526,85 @@ dmesg | grep workqueue
     }
 ]
 
-
+# Articles (and their positions) by id, so single-article lookups don't scan KB_ARTICLES
+_KB_BY_ID = {a["article_id"]: a for a in KB_ARTICLES}
+_KB_POSITIONS = {a["article_id"]: position for position, a in enumerate(KB_ARTICLES)}
+
+# Inverted indexes for get_common_fixes, built once at import: lower-cased product name / tag ->
+# positions of the articles carrying it (a tag repeated on an article is listed once per occurrence)
+_PRODUCT_INDEX = defaultdict(set)
+_TAG_INDEX = defaultdict(list)
+for _position, _article in enumerate(KB_ARTICLES):
+    for _product in _article.get("related_products", []):
+        _PRODUCT_INDEX[_product.lower()].add(_position)
+    for _tag in _article["tags"]:
+        _TAG_INDEX[_tag.lower()].append(_position)
+
+# Normalized searchable fields per article position, so searches don't re-lowercase (or
+# re-build tag sets for) every article on each call
+_TITLES_LOWER = tuple(a["title"].lower() for a in KB_ARTICLES)
+_TAGS_LOWER = tuple(tuple(tag.lower() for tag in a["tags"]) for a in KB_ARTICLES)
+_CONTENTS_LOWER = tuple(a["content"].lower() for a in KB_ARTICLES)
+_CATEGORIES_LOWER = tuple(a["category"].lower() for a in KB_ARTICLES)
+_TAG_SETS = tuple(frozenset(a["tags"]) for a in KB_ARTICLES)
+# Positions of the articles in each lower-cased category, for category-filtered searches
+_CATEGORY_POSITIONS = defaultdict(list)
+for _position, _category in enumerate(_CATEGORIES_LOWER):
+    _CATEGORY_POSITIONS[_category].append(_position)
+# Each article's lower-cased tags in one NUL-separated string: a query found in no tag is absent here too
+_TAGS_JOINED = tuple("\0".join(tags) for tags in _TAGS_LOWER)
+
+# Character n-gram index (n = 1..3) over every searchable field: n-gram -> positions of the articles
+# containing it. Queries up to three characters are answered exactly by one lookup; longer queries
+# can only be a substring of a field if all of their trigrams occur in that article, so intersecting
+# those postings narrows search_articles to the articles worth scoring.
+_GRAM_INDEX = defaultdict(set)
+for _position in range(len(KB_ARTICLES)):
+    for _text in (_TITLES_LOWER[_position], _CONTENTS_LOWER[_position], _CATEGORIES_LOWER[_position],
+                  *_TAGS_LOWER[_position]):
+        for _i in range(len(_text)):
+            for _n in range(1, min(3, len(_text) - _i) + 1):
+                _GRAM_INDEX[_text[_i:_i + _n]].add(_position)
+
+# Each article's tags as a bitmask over one tag vocabulary, so find_related counts shared tags with
+# an integer AND plus popcount instead of intersecting sets
+_TAG_BITS = {}
+for _tags in _TAG_SETS:
+    for _tag in sorted(_tags):
+        _TAG_BITS.setdefault(_tag, 1 << len(_TAG_BITS))
+_TAG_MASKS = tuple(sum(_TAG_BITS[tag] for tag in tags) for tags in _TAG_SETS)
+
+# Raw per-article category column for find_related's scoring loop
+_CATEGORIES = tuple(a["category"] for a in KB_ARTICLES)
+
+# Response fields per article for the result envelopes, prebuilt once and split around the
+# per-result relevance_score so each result is merged from two ready-made dicts
+_RESULT_HEADS = {a["article_id"]: {"article_id": a["article_id"], "title": a["title"], "category": a["category"]} for a in KB_ARTICLES}
+_SEARCH_RESULT_TAILS = {a["article_id"]: {"tags": a["tags"], "views": a["views"], "helpful_count": a["helpful_count"]} for a in KB_ARTICLES}
+_COMMON_FIX_TAILS = {a["article_id"]: {"helpful_count": a["helpful_count"], "tags": a["tags"]} for a in KB_ARTICLES}
+
+# Error payloads for the "article not found" paths, built once; each call fills in the message
+# and article_id
+_ERR_ARTICLE_NOT_FOUND = make_error(
+    "Article not found",
+    reason="The knowledge base does not include that article_id.",
+    hints=[
+        "Call search_solutions with keywords related to the issue.",
+        "Use find_related_articles starting from a known article to explore similar topics."
+    ],
+    retryable=True,
+    follow_up_tools=["search_solutions", "find_related_articles"]
+)
+_ERR_RELATED_SOURCE_NOT_FOUND = make_error(
+    "Article not found",
+    reason="Cannot recommend related content because the source article does not exist.",
+    hints=[
+        "Run search_solutions using the article topic to find existing entries.",
+        "Confirm the article_id format (e.g., KB-001)."
+    ],
+    retryable=True,
+    follow_up_tools=["search_solutions"]
+)
 
 
 # ============================================================================
@@ -505,83 +613,147 @@ dmesg | grep workqueue
 
 def search_solutions(query, category=None, limit=10):
     """Search KB articles. Can be called directly."""
+    try:
+        return dict(_search_solutions(query, category, limit))
+    except TypeError:
+        # Unhashable arguments (e.g. lists) can't be cache keys; build the response directly
+        return dict(_build_search(query, category, limit))
+
+
+def _build_search(query, category, limit):
+    """Build the search_solutions response"""
     search_results = search_articles(query, category, limit)
     return {
         "query": query, "category": category,
-        "results": [{"article_id": r["article"]["article_id"], "title": r["article"]["title"], "category": r["article"]["category"], "relevance_score": r["relevance_score"], "tags": r["article"]["tags"], "views": r["article"]["views"], "helpful_count": r["article"]["helpful_count"]} for r in search_results],
+        "results": [{**_RESULT_HEADS[r["article"]["article_id"]], "relevance_score": r["relevance_score"],
+                     **_SEARCH_RESULT_TAILS[r["article"]["article_id"]]} for r in search_results],
         "total_count": len(search_results)
     }
 
 
+@lru_cache(maxsize=128)
+def _search_solutions(query, category, limit):
+    """Memoized _build_search; KB_ARTICLES never changes, so callers get a copy"""
+    return _build_search(query, category, limit)
+
+
 def get_article(article_id):
     """Get full article content. Can be called directly."""
-    article = next((a for a in KB_ARTICLES if a["article_id"] == article_id), None)
+    try:
+        return dict(_get_article(article_id))
+    except TypeError:
+        return dict(_build_article(article_id))
+
+
+def _build_article(article_id):
+    """Build the get_article response or its not-found error"""
+    article = lookup_article(article_id)
     if not article:
-        return make_error(
-            f"Article {article_id} not found",
-            reason="The knowledge base does not include that article_id.",
-            hints=[
-                "Call search_solutions with keywords related to the issue.",
-                "Use find_related_articles starting from a known article to explore similar topics."
-            ],
-            retryable=True,
-            follow_up_tools=["search_solutions", "find_related_articles"],
-            article_id=article_id
-        )
-    return article.copy()
+        payload = {**_ERR_ARTICLE_NOT_FOUND, "error": f"Article {article_id} not found"}
+        if article_id is not None:
+            payload["article_id"] = article_id
+        return payload
+    return article
+
+
+@lru_cache(maxsize=64)
+def _get_article(article_id):
+    """Memoized _build_article"""
+    return _build_article(article_id)
 
 
 def find_related_articles(article_id=None, topic=None, limit=5):
     """Find related articles. Can be called directly."""
+    try:
+        return dict(_find_related_articles(article_id, topic, limit))
+    except TypeError:
+        return dict(_build_related(article_id, topic, limit))
+
+
+def _build_related(article_id, topic, limit):
+    """Build the find_related_articles response or its not-found error"""
     related = find_related(article_id, topic, limit)
-    if article_id and not related and not any(a["article_id"] == article_id for a in KB_ARTICLES):
-        return make_error(
-            f"Article {article_id} not found",
-            reason="Cannot recommend related content because the source article does not exist.",
-            hints=[
-                "Run search_solutions using the article topic to find existing entries.",
-                "Confirm the article_id format (e.g., KB-001)."
-            ],
-            retryable=True,
-            follow_up_tools=["search_solutions"],
-            article_id=article_id
-        )
+    if article_id and not related and lookup_article(article_id) is None:
+        return {**_ERR_RELATED_SOURCE_NOT_FOUND, "error": f"Article {article_id} not found", "article_id": article_id}
     return {
         "article_id": article_id, "topic": topic,
-        "related_articles": [{"article_id": r["article"]["article_id"], "title": r["article"]["title"], "category": r["article"]["category"], "relevance_score": r["relevance_score"], "common_tags": r.get("common_tags", [])} for r in related],
+        "related_articles": [{**_RESULT_HEADS[r["article"]["article_id"]], "relevance_score": r["relevance_score"], "common_tags": r.get("common_tags", [])}
+                             for r in related],
         "total_found": len(related)
     }
 
 
+@lru_cache(maxsize=128)
+def _find_related_articles(article_id, topic, limit):
+    """Memoized _build_related"""
+    return _build_related(article_id, topic, limit)
+
+
 def get_common_fixes(product=None, issue_type=None):
     """Get common fixes for product/issue. Can be called directly."""
     fixes = get_common_fixes_internal(product, issue_type)
     return {
         "product": product, "issue_type": issue_type,
-        "common_fixes": [{"article_id": f["article"]["article_id"], "title": f["article"]["title"], "category": f["article"]["category"], "relevance_score": f["relevance_score"], "helpful_count": f["article"]["helpful_count"], "tags": f["article"]["tags"]} for f in fixes],
+        "common_fixes": [{**_RESULT_HEADS[f["article"]["article_id"]], "relevance_score": f["relevance_score"],
+                          **_COMMON_FIX_TAILS[f["article"]["article_id"]]} for f in fixes],
         "total_found": len(fixes)
     }
 
+
+def _cache_clear():
+    """Reset the memoized knowledge base responses"""
+    for cached in (_search_solutions, _get_article, _find_related_articles, render_tool_cached):
+        cached.cache_clear()
+
+
+def layer_stats(*cached_functions):
+    """Combined hit/miss counts for memoized functions that form one cache layer"""
+    hits = misses = 0
+    for cached in cached_functions:
+        info = cached.cache_info()
+        hits += info.hits
+        misses += info.misses
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": hits / total if total else 0.0}
+
+
+def get_cache_stats():
+    """
+    Hit/miss counts per cache layer. Can be called directly.
+
+    A tool call checks the rendered-text cache first and only reaches the response builders on a
+    miss, so the layers are reported separately rather than summed.
+    """
+    return {
+        "rendered": layer_stats(render_tool_cached),
+        "responses": layer_stats(_search_solutions, _get_article, _find_related_articles),
+    }
+
+
 # Rename internal helper to avoid conflict
 def get_common_fixes_internal(product=None, issue_type=None):
-    results = []
-    for article in KB_ARTICLES:
-        score = 0
-        if product:
-            for prod in article.get("related_products", []):
-                if product.lower() in prod.lower():
-                    score += 10
-                    break
-        if issue_type:
-            if issue_type.lower() in article["title"].lower():
-                score += 8
-            for tag in article["tags"]:
-                if issue_type.lower() in tag.lower():
-                    score += 5
-        if score > 0:
-            results.append({"article": article, "relevance_score": score})
-    results.sort(key=lambda x: x["relevance_score"], reverse=True)
-    return results[:10]
+    # Scores accumulate per article position; matching walks the distinct index keys, not every article
+    scores = defaultdict(int)
+    if product:
+        product_lower = product.lower()
+        matched = set()
+        for name, positions in _PRODUCT_INDEX.items():
+            if product_lower in name:
+                matched |= positions
+        for position in matched:
+            scores[position] += 10
+    if issue_type:
+        issue_lower = issue_type.lower()
+        for position, title in enumerate(_TITLES_LOWER):
+            if issue_lower in title:
+                scores[position] += 8
+        for tag, positions in _TAG_INDEX.items():
+            if issue_lower in tag:
+                for position in positions:
+                    scores[position] += 5
+    # Visit positions in dataset order so equal scores keep their original order
+    ranked = top_scored([(position, scores[position]) for position in sorted(scores)], 10)
+    return [{"article": KB_ARTICLES[position], "relevance_score": score} for position, score in ranked]
 
 
 # ============================================================================
@@ -593,154 +765,233 @@ app = Server("knowledge-base-server")
 
 
 # Helper functions
-def search_articles(query, category=None, limit=10):
-    """Search articles by keyword in title, content, and tags"""
-    results = []
-    query_lower = query.lower() if query else ""
+def top_scored(scored, limit):
+    """The `limit` highest-scoring (position, score) pairs; equal scores keep their scan order"""
+    if limit < 0:
+        # A negative limit slices from the end, as the original sort-then-slice did
+        return sorted(scored, key=itemgetter(1), reverse=True)[:limit]
+    return heapq.nlargest(limit, scored, key=itemgetter(1))
+
+
+def lookup_article(article_id):
+    """The article with this ID, or None (unhashable IDs match nothing)"""
+    try:
+        return _KB_BY_ID.get(article_id)
+    except TypeError:
+        return None
+
+
+def candidate_positions(query_lower):
+    """Positions of the articles that may contain query_lower, or None for the empty query (matches all)"""
+    if not query_lower:
+        return None
+    if len(query_lower) <= 3:
+        return _GRAM_INDEX.get(query_lower, set())
+    postings = [_GRAM_INDEX.get(query_lower[i:i + 3]) for i in range(len(query_lower) - 2)]
+    if not all(postings):
+        return set()
+    return set.intersection(*postings)
 
-    for article in KB_ARTICLES:
-        score = 0
 
-        # Search in title (highest weight)
-        if query_lower in article["title"].lower():
-            score += 10
+def search_articles(query, category=None, limit=10):
+    """Search articles by keyword in title, content, and tags"""
+    return [{"article": KB_ARTICLES[position], "relevance_score": score}
+            for position, score in _search_scores(query, category, limit)]
 
-        # Search in tags
-        for tag in article["tags"]:
-            if query_lower in tag.lower():
-                score += 5
 
-        # Search in content
-        if query_lower in article["content"].lower():
-            score += 3
+def _search_scores(query, category, limit):
+    """Ranked (position, score) pairs for search_articles"""
+    results = []
+    query_lower = query.lower() if query else ""
+    category_lower = category.lower() if category else None
+
+    # Only score the n-gram candidates (within the category, if one is given), in dataset order so
+    # ties keep their order
+    candidates = candidate_positions(query_lower)
+    if category:
+        positions = _CATEGORY_POSITIONS.get(category_lower, ())
+        if candidates is not None:
+            positions = [position for position in positions if position in candidates]
+    else:
+        positions = range(len(KB_ARTICLES)) if candidates is None else sorted(candidates)
+    for position in positions:
+        # Weighted sum of field matches: title 10 (highest), each matching tag 5, category 4, content 3.
+        # Fields are scanned shortest first, leaving the long content scan for last.
+        score = 4 * (query_lower in _CATEGORIES_LOWER[position]) + 10 * (query_lower in _TITLES_LOWER[position])
 
-        # Search in category
-        if query_lower in article["category"].lower():
-            score += 4
+        # Only count matching tags when one scan of the joined tags says there can be any
+        if query_lower in _TAGS_JOINED[position]:
+            score += 5 * sum(query_lower in tag for tag in _TAGS_LOWER[position])
 
-        # Apply category filter
-        if category and article["category"].lower() != category.lower():
-            continue
+        score += 3 * (query_lower in _CONTENTS_LOWER[position])
 
         if score > 0:
-            results.append({
-                "article": article,
-                "relevance_score": score
-            })
+            results.append((position, score))
 
-    # Sort by relevance and limit results
-    results.sort(key=lambda x: x["relevance_score"], reverse=True)
-    return results[:limit]
+    # Keep the best `limit` by relevance
+    return tuple(top_scored(results, limit))
 
 
 def find_related(article_id=None, topic=None, limit=5):
     """Find related articles based on tags and category"""
     if article_id:
-        reference = next((a for a in KB_ARTICLES if a["article_id"] == article_id), None)
-        if not reference:
+        if lookup_article(article_id) is None:
             return []
+        return [{"article": KB_ARTICLES[position], "relevance_score": score, "common_tags": list(common_tags)}
+                for position, score, common_tags in _related_scores(article_id, limit)]
 
-        ref_tags = set(reference["tags"])
-        ref_category = reference["category"]
-
-        related = []
-        for article in KB_ARTICLES:
-            if article["article_id"] == article_id:
-                continue
+    elif topic:
+        return search_articles(topic, limit=limit)
 
-            score = 0
-            common_tags = set(article["tags"]) & ref_tags
-            score += len(common_tags) * 3
+    return []
 
-            if article["category"] == ref_category:
-                score += 5
 
-            if score > 0:
-                related.append({
-                    "article": article,
-                    "relevance_score": score,
-                    "common_tags": list(common_tags)
-                })
+def _related_scores(article_id, limit):
+    """Ranked (position, score, common tags) triples for find_related"""
+    reference_position = _KB_POSITIONS.get(article_id)
+    if reference_position is None:
+        return ()
 
-        related.sort(key=lambda x: x["relevance_score"], reverse=True)
-        return related[:limit]
+    ref_tags = _TAG_SETS[reference_position]
+    ref_mask = _TAG_MASKS[reference_position]
+    ref_category = _CATEGORIES[reference_position]
 
-    elif topic:
-        return search_articles(topic, limit=limit)
+    # Score from the per-field columns; the article dicts are only looked up by find_related
+    related = []
+    for position, (tag_mask, category) in enumerate(zip(_TAG_MASKS, _CATEGORIES)):
+        if position == reference_position:
+            continue
 
-    return []
+        score = 0
+        score += (tag_mask & ref_mask).bit_count() * 3
 
+        if category == ref_category:
+            score += 5
 
+        if score > 0:
+            related.append((position, score))
+
+    # Only the returned articles need their shared tags spelled out
+    return tuple((position, score, tuple(_TAG_SETS[position] & ref_tags)) for position, score in top_scored(related, limit))
+
+
+
+
+# Tool definitions never change, so they are built once at import and reused by list_tools
+TOOLS = [
+    Tool(
+        name="search_solutions",
+        description="Search knowledge base for solutions and articles by keyword or topic",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query or keywords"},
+                "category": {"type": "string", "description": "Article category filter"},
+                "limit": {"type": "number", "description": "Maximum number of results to return"}
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="get_article",
+        description="Retrieve the full content of a knowledge base article by ID",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "article_id": {"type": "string", "description": "Unique article identifier"}
+            },
+            "required": ["article_id"]
+        }
+    ),
+    Tool(
+        name="find_related_articles",
+        description="Find articles related to a given article or topic",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "article_id": {"type": "string", "description": "Reference article ID"},
+                "topic": {"type": "string", "description": "Topic to find related articles for"},
+                "limit": {"type": "number", "description": "Maximum number of related articles"}
+            }
+        }
+    ),
+    Tool(
+        name="get_common_fixes",
+        description="Get a list of common fixes and solutions for a specific product or issue type",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "product": {"type": "string", "description": "Product name or identifier"},
+                "issue_type": {"type": "string", "description": "Type of issue (e.g., 'bsod', 'network', 'performance')"}
+            }
+        }
+    )
+]
 
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available knowledge base tools"""
-    return [
-        Tool(
-            name="search_solutions",
-            description="Search knowledge base for solutions and articles by keyword or topic",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "Search query or keywords"},
-                    "category": {"type": "string", "description": "Article category filter"},
-                    "limit": {"type": "number", "description": "Maximum number of results to return"}
-                },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="get_article",
-            description="Retrieve the full content of a knowledge base article by ID",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "article_id": {"type": "string", "description": "Unique article identifier"}
-                },
-                "required": ["article_id"]
-            }
-        ),
-        Tool(
-            name="find_related_articles",
-            description="Find articles related to a given article or topic",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "article_id": {"type": "string", "description": "Reference article ID"},
-                    "topic": {"type": "string", "description": "Topic to find related articles for"},
-                    "limit": {"type": "number", "description": "Maximum number of related articles"}
-                }
-            }
-        ),
-        Tool(
-            name="get_common_fixes",
-            description="Get a list of common fixes and solutions for a specific product or issue type",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "product": {"type": "string", "description": "Product name or identifier"},
-                    "issue_type": {"type": "string", "description": "Type of issue (e.g., 'bsod', 'network', 'performance')"}
-                }
-            }
-        )
-    ]
+    return TOOLS
+
+
+# Tool name -> handler taking the raw arguments dict and returning the result dict
+TOOL_HANDLERS = {
+    "search_solutions": lambda arguments: search_solutions(
+        arguments.get("query"), arguments.get("category"), int(arguments.get("limit", 10))),
+    "get_article": lambda arguments: get_article(arguments.get("article_id")),
+    "find_related_articles": lambda arguments: find_related_articles(
+        arguments.get("article_id"), arguments.get("topic"), int(arguments.get("limit", 5))),
+    "get_common_fixes": lambda arguments: get_common_fixes(arguments.get("product"), arguments.get("issue_type")),
+}
+
+
+def render_tool(name, arguments):
+    """Run a tool and serialize its result as TextContent text"""
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return serialize_result(handler(arguments))
+
+
+@lru_cache(maxsize=256)
+def render_tool_cached(name, frozen_arguments):
+    """Memoized render_tool, so a large response is serialized once rather than on every call"""
+    return render_tool(name, dict(frozen_arguments))
+
+
+# Tool calls between cache summaries on stderr (stdout carries the MCP protocol)
+CACHE_STATS_INTERVAL = 100
+_tool_calls = 0
+
+
+def log_cache_stats():
+    """Write a one-line cache summary to stderr"""
+    summary = " ".join(f"{layer}: hits={stats['hits']} misses={stats['misses']} hit_ratio={stats['hit_ratio']:.1%}"
+                       for layer, stats in get_cache_stats().items())
+    print(f"[knowledge-base-server] cache {summary}", file=sys.stderr)
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls - delegates to regular Python functions"""
-    if name == "search_solutions":
-        result = search_solutions(arguments.get("query"), arguments.get("category"), int(arguments.get("limit", 10)))
-    elif name == "get_article":
-        result = get_article(arguments.get("article_id"))
-    elif name == "find_related_articles":
-        result = find_related_articles(arguments.get("article_id"), arguments.get("topic"), int(arguments.get("limit", 5)))
-    elif name == "get_common_fixes":
-        result = get_common_fixes(arguments.get("product"), arguments.get("issue_type"))
+    global _tool_calls
+    _tool_calls += 1
+    if _tool_calls % CACHE_STATS_INTERVAL == 0:
+        log_cache_stats()
+    try:
+        frozen_arguments = frozenset(arguments.items())
+    except TypeError:
+        # Unhashable argument values (e.g. lists) can't be cache keys; render them directly
+        frozen_arguments = None
+    # Searching and serialization are synchronous; run them in the default thread pool so
+    # concurrent requests don't queue up behind each other on the event loop
+    loop = asyncio.get_running_loop()
+    if frozen_arguments is None:
+        text = await loop.run_in_executor(None, render_tool, name, arguments)
     else:
-        raise ValueError(f"Unknown tool: {name}")
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        text = await loop.run_in_executor(None, render_tool_cached, name, frozen_arguments)
+    return [TextContent(type="text", text=text)]
 
 
 
@@ -7,11 +7,18 @@ Works seamlessly in both regular Python and Jupyter notebooks
 import asyncio
 import json
 import sys
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from collections import OrderedDict
+from datetime import date
+from typing import List, Dict, Any, Optional, Callable
+from openai import AsyncOpenAI
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
 
 # Jupyter/IPython detection and event loop handling
 def _is_jupyter():
@@ -70,6 +77,20 @@ def _run_async(coro):
         return loop.run_until_complete(coro)
 
 
+def _dumps(payload: Any) -> str:
+    """Serialize a payload as JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload)
+
+
+def _loads(text: str) -> Any:
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
 def _make_error_payload(message: str, *, reason: Optional[str] = None, hints: Optional[List[str]] = None,
                         retryable: bool = False, follow_up_tools: Optional[List[str]] = None,
                         context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -98,7 +119,19 @@ def _make_error_json(*, message: str, reason: Optional[str] = None, hints: Optio
         follow_up_tools=follow_up_tools,
         context=context
     )
-    return json.dumps(payload)
+    return _dumps(payload)
+
+
+# System message opening every conversation; shared across queries and never mutated
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a helpful IT support assistant. You have access to various tools to help answer questions about tickets, customers, billing, knowledge base articles, and assets. Use the tools to gather information needed to answer the user's questions accurately."
+}
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Cache key for a prompt: case and whitespace differences don't change the question."""
+    return " ".join(prompt.casefold().split())
 
 
 class MCPOrchestrator:
@@ -109,6 +142,10 @@ class MCPOrchestrator:
     Works seamlessly in both Jupyter notebooks and regular Python scripts.
     """
 
+    # Final answers remembered per normalized prompt, day and iteration limit (least recently used
+    # evicted first). Off by default: cached answers skip every tool call, so nothing reaches the servers.
+    ANSWER_CACHE_SIZE = 0
+
     def __init__(self):
         """Initialize the orchestrator"""
         self.server_processes = {}
@@ -116,6 +153,14 @@ class MCPOrchestrator:
         self.available_tools = []
         self.tool_to_server_map = {}
         self._initialized = False
+        # OpenAI-format tool list, and the available_tools list it was built from
+        self._openai_tools_cache = None
+        self._openai_tools_source = None
+        self._answer_cache = OrderedDict()
+        # OpenAI client reused across queries so its connection pool stays warm
+        self._openai_client = None
+        # Callables invoked as listener(tool_name, arguments) before every tool call
+        self.tool_call_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
 
         # Define server configurations
         self.server_configs = {
@@ -176,6 +221,7 @@ class MCPOrchestrator:
 
         print("Starting MCP servers...")
 
+        started = []
         for server_name, config in self.server_configs.items():
             try:
                 print(f"  - Starting {server_name} server ({config['description']})...")
@@ -191,28 +237,34 @@ class MCPOrchestrator:
                 stdio_transport = stdio_client(server_params)
                 stdio, write = await stdio_transport.__aenter__()
 
-                # Create and initialize client session
+                # Create client session
                 session = ClientSession(stdio, write)
                 await session.__aenter__()
 
-                # Initialize the session
-                await session.initialize()
-
                 # Store the session
                 self.server_sessions[server_name] = {
                     "session": session,
                     "transport": stdio_transport
                 }
-
-                print(f"    ✓ {server_name} server started successfully")
-
-                # Small delay to ensure server is ready
-                await asyncio.sleep(0.5)
+                started.append(server_name)
 
             except Exception as e:
                 print(f"    ✗ Failed to start {server_name} server: {e}")
                 raise
 
+        # Initialize the sessions concurrently: each handshake waits for its server process to boot,
+        # so startup takes as long as the slowest server instead of the sum of all of them. The
+        # transport and session contexts above stay entered from this task, which later exits them.
+        results = await asyncio.gather(
+            *(self.server_sessions[server_name]["session"].initialize() for server_name in started),
+            return_exceptions=True
+        )
+        for server_name, result in zip(started, results):
+            if isinstance(result, Exception):
+                print(f"    ✗ Failed to start {server_name} server: {result}")
+                raise result
+            print(f"    ✓ {server_name} server started successfully")
+
         self._initialized = True
         print("All servers started successfully!\n")
 
@@ -267,23 +319,26 @@ class MCPOrchestrator:
 
         print("Collecting available tools from servers...")
 
-        for server_name, server_info in self.server_sessions.items():
-            try:
-                session = server_info["session"]
-
-                # List tools from this server
-                tools_response = await session.list_tools()
+        # List tools from every server concurrently, then merge them in server order
+        server_names = list(self.server_sessions)
+        responses = await asyncio.gather(
+            *(self.server_sessions[server_name]["session"].list_tools() for server_name in server_names),
+            return_exceptions=True
+        )
 
-                # Add tools and map them to their server
-                for tool in tools_response.tools:
-                    all_tools.append(tool)
-                    self.tool_to_server_map[tool.name] = server_name
-                    print(f"  - {tool.name} ({server_name})")
+        for server_name, tools_response in zip(server_names, responses):
+            if isinstance(tools_response, Exception):
+                print(f"  ✗ Error getting tools from {server_name}: {tools_response}")
+                continue
 
-            except Exception as e:
-                print(f"  ✗ Error getting tools from {server_name}: {e}")
+            # Add tools and map them to their server
+            for tool in tools_response.tools:
+                all_tools.append(tool)
+                self.tool_to_server_map[tool.name] = server_name
+                print(f"  - {tool.name} ({server_name})")
 
         self.available_tools = all_tools
+        self._openai_tools_cache = None
         print(f"\nTotal tools available: {len(all_tools)}\n")
         return all_tools
 
@@ -308,6 +363,10 @@ class MCPOrchestrator:
         Returns:
             List of tools in OpenAI format
         """
+        # Reuse the converted list until get_available_tools replaces available_tools
+        if self._openai_tools_cache is not None and self._openai_tools_source is self.available_tools:
+            return self._openai_tools_cache
+
         openai_tools = []
 
         for tool in self.available_tools:
@@ -321,6 +380,8 @@ class MCPOrchestrator:
             }
             openai_tools.append(openai_tool)
 
+        self._openai_tools_cache = openai_tools
+        self._openai_tools_source = self.available_tools
         return openai_tools
 
     def call_mcp_tool(self, tool_name: str, arguments: Dict[str, Any]) -> str:
@@ -340,6 +401,9 @@ class MCPOrchestrator:
 
     async def _async_call_mcp_tool(self, tool_name: str, arguments: Dict[str, Any]) -> str:
         """Internal async implementation of call_mcp_tool"""
+        for listener in self.tool_call_listeners:
+            listener(tool_name, arguments)
+
         # Find which server has this tool
         server_name = self.tool_to_server_map.get(tool_name)
 
@@ -381,7 +445,7 @@ class MCPOrchestrator:
             if result.content and len(result.content) > 0:
                 return result.content[0].text
             else:
-                return json.dumps({"result": "Tool executed successfully but returned no content"})
+                return _dumps({"result": "Tool executed successfully but returned no content"})
 
         except Exception as e:
             return _make_error_json(
@@ -395,6 +459,12 @@ class MCPOrchestrator:
                 context={"tool_name": tool_name}
             )
 
+    def _get_openai_client(self, api_key: str) -> AsyncOpenAI:
+        """Return the shared client, building a new one only on first use or if the API key changed"""
+        if self._openai_client is None or self._openai_client.api_key != api_key:
+            self._openai_client = AsyncOpenAI(api_key=api_key)
+        return self._openai_client
+
     def query(self, prompt: str, api_key: str, max_iterations: int = 10) -> str:
         """
         Process a user query using OpenAI gpt-5-nano with function calling.
@@ -419,18 +489,24 @@ class MCPOrchestrator:
 
     async def _async_query(self, prompt: str, api_key: str, max_iterations: int = 10) -> str:
         """Internal async implementation of query"""
-        # Initialize OpenAI client
-        client = OpenAI(api_key=api_key)
+        # Warranty days, overdue balances and ticket metrics are relative to today, so a cached
+        # answer is only reused on the day it was produced
+        cache_key = (_normalize_prompt(prompt), date.today(), max_iterations)
+        cached_answer = self._answer_cache.get(cache_key)
+        if cached_answer is not None:
+            self._answer_cache.move_to_end(cache_key)
+            print("\n✅ Answer served from cache")
+            return cached_answer
+
+        # OpenAI client (async, so concurrent queries don't block each other)
+        client = self._get_openai_client(api_key)
 
         # Get tools in OpenAI format
         openai_tools = self.convert_mcp_tools_to_openai_format()
 
         # Initialize conversation with user prompt
         messages = [
-            {
-                "role": "system",
-                "content": "You are a helpful IT support assistant. You have access to various tools to help answer questions about tickets, customers, billing, knowledge base articles, and assets. Use the tools to gather information needed to answer the user's questions accurately."
-            },
+            SYSTEM_MESSAGE,
             {
                 "role": "user",
                 "content": prompt
@@ -445,7 +521,7 @@ class MCPOrchestrator:
                 print(f"{'='*60}")
 
                 # Call OpenAI API with tools
-                response = client.chat.completions.create(
+                response = await client.chat.completions.create(
                     model="gpt-5-nano",
                     messages=messages,
                     tools=openai_tools,
@@ -461,10 +537,9 @@ class MCPOrchestrator:
                     # Add assistant's response to messages
                     messages.append(response_message)
 
-                    # Execute each tool call
-                    for tool_call in response_message.tool_calls:
+                    async def run_tool_call(tool_call):
                         function_name = tool_call.function.name
-                        function_args = json.loads(tool_call.function.arguments)
+                        function_args = _loads(tool_call.function.arguments)
 
                         print(f"  - Calling: {function_name}")
                         print(f"    Arguments: {json.dumps(function_args, indent=6)}")
@@ -472,13 +547,20 @@ class MCPOrchestrator:
                         # Execute the tool on the appropriate MCP server
                         tool_result = await self._async_call_mcp_tool(function_name, function_args)
 
-                        print(f"    Result preview: {tool_result[:200]}...")
+                        print(f"    Result preview ({function_name}): {tool_result[:200]}...")
+                        return tool_result
+
+                    # The tool calls are independent, so run them concurrently
+                    tool_results = await asyncio.gather(
+                        *(run_tool_call(tool_call) for tool_call in response_message.tool_calls)
+                    )
 
-                        # Add tool result to messages
+                    # Add tool results to messages, in the order the model requested them
+                    for tool_call, tool_result in zip(response_message.tool_calls, tool_results):
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
-                            "name": function_name,
+                            "name": tool_call.function.name,
                             "content": tool_result
                         })
 
@@ -489,6 +571,10 @@ class MCPOrchestrator:
                     # No more tool calls - this is the final answer
                     final_answer = response_message.content
                     print(f"\n✅ Final answer received")
+                    if final_answer and self.ANSWER_CACHE_SIZE > 0:
+                        self._answer_cache[cache_key] = final_answer
+                        if len(self._answer_cache) > self.ANSWER_CACHE_SIZE:
+                            self._answer_cache.popitem(last=False)
                     return final_answer
 
             except Exception as e:
@@ -499,6 +585,32 @@ class MCPOrchestrator:
         # If we hit max iterations, return what we have
         return "I've reached the maximum number of tool calls. Please try rephrasing your question or breaking it into smaller parts."
 
+    def query_many(self, prompts: List[str], api_key: str, max_concurrency: int = 4) -> List[str]:
+        """
+        Process several independent queries concurrently.
+
+        Works in both Jupyter notebooks and regular Python.
+
+        Args:
+            prompts: User questions; each runs its own conversation loop
+            api_key: OpenAI API key
+            max_concurrency: Maximum number of queries in flight at once (keeps clear of rate limits)
+
+        Returns:
+            Final text responses, in the same order as prompts
+        """
+        return _run_async(self._async_query_many(prompts, api_key, max_concurrency))
+
+    async def _async_query_many(self, prompts: List[str], api_key: str, max_concurrency: int = 4) -> List[str]:
+        """Internal async implementation of query_many"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self._async_query(prompt, api_key)
+
+        return list(await asyncio.gather(*(run(prompt) for prompt in prompts)))
+
     def interactive_mode(self, api_key: str):
         """
         Run an interactive chat session where users can ask questions.
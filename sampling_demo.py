@@ -19,56 +19,86 @@ import asyncio
 import json
 import os
 import sys
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime, timedelta
+from heapq import nlargest
+from operator import itemgetter
+from typing import List, Dict, Any, NamedTuple
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
 
 # ============================================================================
 # MOCK E-COMMERCE TRANSACTION DATA
 # ============================================================================
 
-def generate_transaction_data(customer_id: str, num_transactions: int = 50) -> List[Dict[str, Any]]:
+class Transaction(NamedTuple):
+    """Transaction record; convert it back to a dict with _asdict() where one is needed"""
+    transaction_id: str
+    customer_id: str
+    date: str
+    amount: float
+    category: str
+    status: str
+    payment_method: str
+    merchant: str
+
+
+def generate_transaction_data(customer_id: str, num_transactions: int = 50) -> List[Transaction]:
     """Generate realistic mock transaction data for a customer"""
     categories = [
         "Electronics", "Clothing", "Books", "Home & Garden",
         "Sports", "Food & Groceries", "Health & Beauty", "Toys"
     ]
 
-    transactions = []
-    base_date = datetime.now() - timedelta(days=365)
-
-    for i in range(num_transactions):
-        transaction_date = base_date + timedelta(days=i * 7)
+    # Different spending amounts by category: (base, cycle, step) -> base + (i % cycle) * step
+    amount_rules = {
+        "Electronics": (100, 5, 50),
+        "Clothing": (30, 3, 20),
+        "Food & Groceries": (50, 4, 15),
+    }
+    category_rules = [amount_rules.get(category, (20, 6, 10)) for category in categories]
+    # Each category has three stores; format their names once and share the strings across rows
+    merchant_names = [[f"{category} Store {n}" for n in (1, 2, 3)] for category in categories]
+    id_prefix = f"TXN-{customer_id}-"
 
+    base_date = datetime.now() - timedelta(days=365)
+    indexes = range(num_transactions)
+
+    # Build the data a column at a time, then zip the columns into transaction records at the end
+    category_column = [categories[i % len(categories)] for i in indexes]
+    merchant_column = [merchant_names[i % len(categories)][i % 3] for i in indexes]
+    # Weekly dates are a progression of day ordinals; isoformat() gives the same YYYY-MM-DD as strftime
+    base_ordinal = base_date.toordinal()
+    date_column = [date.fromordinal(base_ordinal + i * 7).isoformat() for i in indexes]
+    amount_column = []
+    for i in indexes:
         # Simulate realistic spending patterns
-        category = categories[i % len(categories)]
-
-        # Different spending amounts by category
-        if category == "Electronics":
-            amount = round(100 + (i % 5) * 50, 2)
-        elif category == "Clothing":
-            amount = round(30 + (i % 3) * 20, 2)
-        elif category == "Food & Groceries":
-            amount = round(50 + (i % 4) * 15, 2)
-        else:
-            amount = round(20 + (i % 6) * 10, 2)
+        base, cycle, step = category_rules[i % len(categories)]
+        amount_column.append(round(base + (i % cycle) * step, 2))
 
-        transactions.append({
-            "transaction_id": f"TXN-{customer_id}-{i+1:04d}",
-            "customer_id": customer_id,
-            "date": transaction_date.strftime("%Y-%m-%d"),
-            "amount": amount,
-            "category": category,
-            "status": "completed" if i % 20 != 0 else "pending",
-            "payment_method": "credit_card" if i % 3 == 0 else "debit_card",
-            "merchant": f"{category} Store {(i % 3) + 1}"
-        })
-
-    return transactions
+    return [
+        Transaction(
+            transaction_id=f"{id_prefix}{i+1:04d}",
+            customer_id=customer_id,
+            date=txn_date,
+            amount=amount,
+            category=category,
+            status="completed" if i % 20 != 0 else "pending",
+            payment_method="credit_card" if i % 3 == 0 else "debit_card",
+            merchant=merchant
+        )
+        for i, txn_date, amount, category, merchant in zip(
+            indexes, date_column, amount_column, category_column, merchant_column
+        )
+    ]
 
 
 # Customer transaction datasets
@@ -78,14 +108,15 @@ CUSTOMER_TRANSACTIONS = {
     "CUST-003": generate_transaction_data("CUST-003", 30),
 }
 
-print(f"Loaded transaction data for {len(CUSTOMER_TRANSACTIONS)} customers")
+# Progress messages go to stderr: in server mode stdout carries the MCP protocol
+print(f"Loaded transaction data for {len(CUSTOMER_TRANSACTIONS)} customers", file=sys.stderr)
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def anonymize_transactions(transactions: List[Dict[str, Any]]) -> str:
+def anonymize_transactions(transactions: List[Transaction]) -> str:
     """
     Anonymize transaction data for safe sharing with LLM.
     Removes sensitive identifiers while preserving analytical value.
@@ -93,50 +124,79 @@ def anonymize_transactions(transactions: List[Dict[str, Any]]) -> str:
     anonymized = []
     for txn in transactions:
         anonymized.append({
-            "date": txn["date"],
-            "amount": txn["amount"],
-            "category": txn["category"],
-            "status": txn["status"]
+            "date": txn.date,
+            "amount": txn.amount,
+            "category": txn.category,
+            "status": txn.status
         })
     return json.dumps(anonymized, indent=2)
 
 
-def calculate_spending_stats(transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+def calculate_spending_stats(transactions: List[Transaction]) -> Dict[str, Any]:
     """Calculate aggregate statistics from transactions"""
     if not transactions:
         return {}
 
-    total_amount = sum(txn["amount"] for txn in transactions)
-    avg_amount = total_amount / len(transactions)
-
-    # Category breakdown
-    category_totals = {}
+    # Overall total, category breakdown and payment status counts in one pass
+    total_amount = 0
+    category_totals = defaultdict(int)
+    completed = 0
+    pending = 0
     for txn in transactions:
-        cat = txn["category"]
-        category_totals[cat] = category_totals.get(cat, 0) + txn["amount"]
-
-    # Sort categories by spending
-    top_categories = sorted(
-        category_totals.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:3]
-
-    # Payment status
-    completed = len([t for t in transactions if t["status"] == "completed"])
-    pending = len([t for t in transactions if t["status"] == "pending"])
+        amount = txn.amount
+        total_amount += amount
+        cat = txn.category
+        category_totals[cat] += amount
+        status = txn.status
+        if status == "completed":
+            completed += 1
+        elif status == "pending":
+            pending += 1
+    num_transactions = len(transactions)
+    avg_amount = total_amount / num_transactions
+
+    # Top 3 categories by spending (ties keep insertion order, as a stable sort would)
+    top_categories = nlargest(3, category_totals.items(), key=itemgetter(1))
 
     return {
-        "total_transactions": len(transactions),
+        "total_transactions": num_transactions,
         "total_amount": round(total_amount, 2),
         "average_amount": round(avg_amount, 2),
         "top_categories": [{"category": cat, "amount": round(amt, 2)} for cat, amt in top_categories],
         "completed_transactions": completed,
         "pending_transactions": pending,
-        "date_range": f"{transactions[0]['date']} to {transactions[-1]['date']}"
+        "date_range": f"{transactions[0].date} to {transactions[-1].date}"
     }
 
 
+# Spending statistics per customer, computed once since CUSTOMER_TRANSACTIONS never changes after import
+_SPENDING_STATS = {
+    customer_id: calculate_spending_stats(transactions)
+    for customer_id, transactions in CUSTOMER_TRANSACTIONS.items()
+}
+
+# Anonymized JSON sent with each customer's sampling request, serialized once for the same reason
+_ANONYMIZED_TRANSACTIONS = {
+    customer_id: anonymize_transactions(transactions)
+    for customer_id, transactions in CUSTOMER_TRANSACTIONS.items()
+}
+
+
+# Tool responses are compact JSON by default; set MCP_PRETTY=1 to indent them for debugging
+PRETTY_JSON = os.getenv("MCP_PRETTY") == "1"
+
+
+def serialize_result(result: dict, pretty: bool = PRETTY_JSON) -> str:
+    """Serialize a tool result for TextContent, using orjson when it is installed."""
+    if orjson is not None:
+        if pretty:
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+        return orjson.dumps(result).decode()
+    if pretty:
+        return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"))
+
+
 # ============================================================================
 # MCP SERVER WITH SAMPLING
 # ============================================================================
@@ -171,6 +231,21 @@ async def list_tools() -> list[Tool]:
                 "required": ["customer_id"]
             }
         ),
+        Tool(
+            name="analyze_payment_patterns_batch",
+            description="Analyze spending patterns of several customers with a single AI sampling request",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "customer_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Customer IDs (e.g., [\"CUST-001\", \"CUST-002\"])"
+                    }
+                },
+                "required": ["customer_ids"]
+            }
+        ),
         Tool(
             name="get_transaction_summary",
             description="Get statistical summary of customer transactions (no AI processing)",
@@ -188,6 +263,10 @@ async def list_tools() -> list[Tool]:
     ]
 
 
+# Analysis returned in place of sampling when no OpenAI API key is configured
+SAMPLING_DISABLED_MESSAGE = "⚠️ Sampling simulation requires OPENAI_API_KEY. Using fallback analysis."
+
+
 async def analyze_payment_patterns(customer_id: str) -> Dict[str, Any]:
     """
     Analyze payment patterns using sampling (server asks host LLM for help).
@@ -213,22 +292,26 @@ async def analyze_payment_patterns(customer_id: str) -> Dict[str, Any]:
             "available_customers": list(CUSTOMER_TRANSACTIONS.keys())
         }
 
-    print(f"\n📊 Server has {len(transactions)} transactions for {customer_id}")
-    print(f"🔒 Raw transaction data stays on server (privacy preserved)")
+    print(f"\n📊 Server has {len(transactions)} transactions for {customer_id}", file=sys.stderr)
+    print(f"🔒 Raw transaction data stays on server (privacy preserved)", file=sys.stderr)
 
     # Step 2: Calculate statistical summary
-    stats = calculate_spending_stats(transactions)
+    stats = dict(_SPENDING_STATS[customer_id])
 
     # Step 3: Use SAMPLING to get AI-powered analysis
-    # This is where the magic happens: server asks host LLM for help
-    print(f"🤖 Server requesting sampling from host LLM...")
+    if not os.getenv("OPENAI_API_KEY"):
+        # Sampling could only return the fallback, so skip building the prompt
+        ai_analysis = SAMPLING_DISABLED_MESSAGE
+    else:
+        # This is where the magic happens: server asks host LLM for help
+        print(f"🤖 Server requesting sampling from host LLM...", file=sys.stderr)
 
-    # Anonymize data before sending to LLM
-    anonymized_data = anonymize_transactions(transactions)
+        # Anonymize data before sending to LLM
+        anonymized_data = _ANONYMIZED_TRANSACTIONS[customer_id]
 
-    # NOTE: In a real MCP implementation, this would use the sampling API
-    # For this demo, we'll simulate it with a direct OpenAI call
-    sampling_prompt = f"""
+        # NOTE: In a real MCP implementation, this would use the sampling API
+        # For this demo, we'll simulate it with a direct OpenAI call
+        sampling_prompt = f"""
 Analyze the following customer spending patterns and provide insights:
 
 Transaction Data (anonymized):
@@ -241,10 +324,10 @@ Provide a 3-4 sentence summary covering:
 4. Any notable patterns or recommendations
 """
 
-    # Simulate sampling (in real MCP, this would be session.request_sampling())
-    ai_analysis = await simulate_sampling(sampling_prompt)
+        # Simulate sampling (in real MCP, this would be session.request_sampling())
+        ai_analysis = await simulate_sampling(sampling_prompt)
 
-    print(f"✅ Sampling complete (AI analysis received)")
+        print(f"✅ Sampling complete (AI analysis received)", file=sys.stderr)
 
     # Step 4: Combine stats + AI analysis
     return {
@@ -255,7 +338,111 @@ Provide a 3-4 sentence summary covering:
     }
 
 
-async def simulate_sampling(prompt: str) -> str:
+# Batch analyses already received, keyed by the tuple of customer IDs analyzed together;
+# least recently used entries are evicted once BATCH_CACHE_SIZE batches are stored
+BATCH_CACHE_SIZE = 64
+_BATCH_ANALYSIS_CACHE: "OrderedDict[tuple, Dict[str, str]]" = OrderedDict()
+
+
+async def analyze_payment_patterns_batch(customer_ids: List[str]) -> Dict[str, Any]:
+    """
+    Analyze several customers with a single sampling request instead of one per customer.
+
+    Returns {customer_id: result}, where each result has the same shape as
+    analyze_payment_patterns. Customers are labelled "Customer 1", "Customer 2", ...
+    in the prompt, so their IDs stay on the server too.
+    """
+    results = {}
+    known_ids = []
+    for customer_id in dict.fromkeys(customer_ids):
+        if customer_id in CUSTOMER_TRANSACTIONS:
+            known_ids.append(customer_id)
+        else:
+            results[customer_id] = {
+                "error": f"Customer {customer_id} not found",
+                "available_customers": list(CUSTOMER_TRANSACTIONS.keys())
+            }
+
+    if not known_ids:
+        return results
+
+    cache_key = tuple(known_ids)
+    analyses = _BATCH_ANALYSIS_CACHE.get(cache_key)
+    if analyses is not None:
+        _BATCH_ANALYSIS_CACHE.move_to_end(cache_key)
+    elif not os.getenv("OPENAI_API_KEY"):
+        # Sampling could only return the fallback, so skip building the prompt
+        analyses = {customer_id: SAMPLING_DISABLED_MESSAGE for customer_id in known_ids}
+    if analyses is None:
+        labels = {customer_id: f"Customer {n}" for n, customer_id in enumerate(known_ids, 1)}
+        customer_blocks = "\n\n".join(
+            f"<{labels[customer_id]}>:\n{_ANONYMIZED_TRANSACTIONS[customer_id]}" for customer_id in known_ids
+        )
+        sampling_prompt = f"""
+Analyze the spending patterns of each of the following customers and provide insights.
+
+{customer_blocks}
+
+For each customer, provide a 3-4 sentence summary covering:
+1. Overall spending behavior and trends
+2. Top spending categories
+3. Payment reliability
+4. Any notable patterns or recommendations
+
+Respond with a JSON object mapping each customer label (e.g. "Customer 1") to its summary.
+"""
+
+        print(f"🤖 Server requesting one sampling call for {len(known_ids)} customers...", file=sys.stderr)
+        ai_response = await simulate_sampling(
+            sampling_prompt,
+            max_tokens=SAMPLING_MAX_TOKENS * len(known_ids),
+            response_format={"type": "json_object"}
+        )
+
+        try:
+            parsed = json.loads(ai_response)
+        except ValueError:
+            parsed = None
+
+        if isinstance(parsed, dict):
+            analyses = {customer_id: str(parsed.get(labels[customer_id], "")) for customer_id in known_ids}
+            _BATCH_ANALYSIS_CACHE[cache_key] = analyses
+            if len(_BATCH_ANALYSIS_CACHE) > BATCH_CACHE_SIZE:
+                _BATCH_ANALYSIS_CACHE.popitem(last=False)
+        else:
+            # Fallback or failure message: every customer gets it, and it is not cached
+            analyses = {customer_id: ai_response for customer_id in known_ids}
+
+    for customer_id in known_ids:
+        results[customer_id] = {
+            "customer_id": customer_id,
+            "ai_analysis": analyses[customer_id],
+            "statistics": dict(_SPENDING_STATS[customer_id]),
+            "note": "Raw transaction data was not shared externally. Only anonymized summaries were processed."
+        }
+
+    return {customer_id: results[customer_id] for customer_id in dict.fromkeys(customer_ids)}
+
+
+# OpenAI client shared by sampling requests so its connection pool is reused (created on first use)
+_openai_client = None
+
+
+def _get_openai_client(api_key: str) -> AsyncOpenAI:
+    """Return the shared client, building a new one only on first use or if the API key changed"""
+    global _openai_client
+    if _openai_client is None or _openai_client.api_key != api_key:
+        # Async client, so the server keeps handling other tool calls while a request is in flight
+        _openai_client = AsyncOpenAI(api_key=api_key, timeout=30)
+    return _openai_client
+
+
+# Output budget per customer analysis: 3-4 sentences fit comfortably, and decode time grows with it
+SAMPLING_MAX_TOKENS = 128
+
+
+async def simulate_sampling(prompt: str, max_tokens: int = SAMPLING_MAX_TOKENS,
+                            response_format: Dict[str, Any] = None) -> str:
     """
     Simulate sampling by calling OpenAI directly.
 
@@ -265,17 +452,20 @@ async def simulate_sampling(prompt: str) -> str:
     api_key = os.getenv("OPENAI_API_KEY")
 
     if not api_key:
-        return "⚠️ Sampling simulation requires OPENAI_API_KEY. Using fallback analysis."
+        return SAMPLING_DISABLED_MESSAGE
 
     try:
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
+        client = _get_openai_client(api_key)
+        extra_options = {"response_format": response_format} if response_format else {}
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are a financial analyst providing insights on spending patterns."},
                 {"role": "user", "content": prompt}
             ],
-            max_tokens=200
+            max_tokens=max_tokens,
+            temperature=0.3,
+            **extra_options
         )
         return response.choices[0].message.content
     except Exception as e:
@@ -294,7 +484,7 @@ def get_transaction_summary(customer_id: str) -> Dict[str, Any]:
 
     return {
         "customer_id": customer_id,
-        "summary": calculate_spending_stats(transactions),
+        "summary": dict(_SPENDING_STATS[customer_id]),
         "note": "Statistical summary only (no AI analysis)"
     }
 
@@ -305,11 +495,15 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
 
     if name == "analyze_payment_patterns":
         result = await analyze_payment_patterns(arguments.get("customer_id"))
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=serialize_result(result))]
+
+    elif name == "analyze_payment_patterns_batch":
+        result = await analyze_payment_patterns_batch(arguments.get("customer_ids") or [])
+        return [TextContent(type="text", text=serialize_result(result))]
 
     elif name == "get_transaction_summary":
         result = get_transaction_summary(arguments.get("customer_id"))
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=serialize_result(result))]
 
     else:
         raise ValueError(f"Unknown tool: {name}")
@@ -317,14 +511,14 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
 
 async def main():
     """Run the payment analysis server using stdio transport"""
-    print("\n" + "="*70)
-    print("E-commerce Payment Analysis Server with Sampling")
-    print("="*70)
-    print("\nThis server demonstrates the SAMPLING pattern:")
-    print("  • Server has sensitive transaction data (stays local)")
-    print("  • Server uses sampling to get AI analysis from host LLM")
-    print("  • Only anonymized data is shared (privacy-preserving)")
-    print("\n" + "="*70 + "\n")
+    print("\n" + "="*70, file=sys.stderr)
+    print("E-commerce Payment Analysis Server with Sampling", file=sys.stderr)
+    print("="*70, file=sys.stderr)
+    print("\nThis server demonstrates the SAMPLING pattern:", file=sys.stderr)
+    print("  • Server has sensitive transaction data (stays local)", file=sys.stderr)
+    print("  • Server uses sampling to get AI analysis from host LLM", file=sys.stderr)
+    print("  • Only anonymized data is shared (privacy-preserving)", file=sys.stderr)
+    print("\n" + "="*70 + "\n", file=sys.stderr)
 
     async with stdio_server() as (read_stream, write_stream):
         await app.run(
@@ -373,7 +567,7 @@ async def demo_mode():
     print(f"\n{'─'*70}")
     print("\n📊 Final Result Returned to User:")
     print("="*70)
-    print(json.dumps(result, indent=2))
+    print(serialize_result(result, pretty=True))
 
     print("\n" + "="*70)
     print("✅ Demo Complete!")
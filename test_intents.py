@@ -15,8 +15,19 @@ Usage:
 import os
 import sys
 import json
+import asyncio
+import contextvars
 from typing import List, Dict, Any, Optional
-from mcp_client import MCPOrchestrator
+from mcp_client import MCPOrchestrator, _run_async
+
+
+# Maximum number of test queries in flight at once (keeps clear of API rate limits)
+MAX_CONCURRENT_QUERIES = 5
+
+# Tool calls made by the query running in the current task; each concurrent query sets its own list
+_captured_tools: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar(
+    "captured_tools", default=None
+)
 
 
 # ============================================================================
@@ -142,6 +153,7 @@ class IntentTestRunner:
         self.api_key = api_key
         self.orchestrator = None
         self.results = []
+        self.semaphore = None
 
     def setup(self):
         """Initialize orchestrator and start servers"""
@@ -149,8 +161,19 @@ class IntentTestRunner:
         self.orchestrator = MCPOrchestrator()
         self.orchestrator.start_servers()
         self.orchestrator.get_available_tools()
+        self.orchestrator.tool_call_listeners.append(self._record_tool_call)
         print("✅ All servers started\n")
 
+    @staticmethod
+    def _record_tool_call(tool_name: str, arguments: Dict[str, Any]):
+        """Orchestrator tool call listener: record the call for the query running in this context"""
+        captured_tools = _captured_tools.get()
+        if captured_tools is not None:
+            captured_tools.append({
+                "tool": tool_name,
+                "arguments": arguments
+            })
+
     def teardown(self):
         """Stop servers and clean up"""
         if self.orchestrator:
@@ -158,7 +181,7 @@ class IntentTestRunner:
             self.orchestrator.stop_servers()
             print("✅ All servers stopped\n")
 
-    def run_single_query(self, query: str, test_case: Dict[str, Any]) -> Dict[str, Any]:
+    async def run_single_query(self, query: str, test_case: Dict[str, Any]) -> Dict[str, Any]:
         """
         Run a single query and capture which tools were called
 
@@ -168,23 +191,14 @@ class IntentTestRunner:
             - success: whether the test passed
             - reason: explanation of pass/fail
         """
-        # Monkey-patch to capture tool calls
-        captured_tools = []
-        original_call_tool = self.orchestrator._async_call_mcp_tool
-
-        async def capturing_call_tool(tool_name: str, arguments: Dict[str, Any]) -> str:
-            captured_tools.append({
-                "tool": tool_name,
-                "arguments": arguments
-            })
-            return await original_call_tool(tool_name, arguments)
-
-        self.orchestrator._async_call_mcp_tool = capturing_call_tool
+        async with self.semaphore:
+            # Queries run concurrently as separate tasks, so the capture list is task-local
+            captured_tools = []
+            _captured_tools.set(captured_tools)
 
-        try:
             # Run the query
             print(f"  Testing: '{query}'")
-            response = self.orchestrator.query(query, self.api_key, max_iterations=5)
+            response = await self.orchestrator._async_query(query, self.api_key, max_iterations=5)
 
             # Analyze results
             tool_names = [t["tool"] for t in captured_tools]
@@ -195,10 +209,6 @@ class IntentTestRunner:
 
             return result
 
-        finally:
-            # Restore original method
-            self.orchestrator._async_call_mcp_tool = original_call_tool
-
     def validate_result(self, test_case: Dict[str, Any], captured_tools: List[Dict]) -> Dict[str, Any]:
         """Validate if the captured tools match expectations"""
         tool_names = [t["tool"] for t in captured_tools]
@@ -259,21 +269,22 @@ class IntentTestRunner:
             "reason": "All validations passed"
         }
 
-    def run_test_case(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
+    async def run_test_case(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
         """Run all variations of a test case"""
+        results = await asyncio.gather(
+            *(self.run_single_query(variation, test_case) for variation in test_case["variations"])
+        )
+
+        # Print once every variation is done, so concurrent test cases don't interleave their reports
         print(f"\n{'='*80}")
         print(f"Test Case: {test_case['intent']}")
         print(f"Description: {test_case['description']}")
         print(f"Expected Tools: {', '.join(test_case['expected_tools'])}")
         print(f"{'='*80}\n")
 
-        results = []
-        for variation in test_case["variations"]:
-            result = self.run_single_query(variation, test_case)
-            results.append(result)
-
-            # Print result
+        for result in results:
             status = "✅ PASS" if result["success"] else "❌ FAIL"
+            print(f"  '{result['query']}'")
             print(f"    {status}: {result['reason']}")
             print(f"    Tools: {', '.join(result['tools_called']) if result['tools_called'] else 'None'}")
             print()
@@ -292,7 +303,7 @@ class IntentTestRunner:
             "passed": passed,
             "failed": total - passed,
             "success_rate": success_rate,
-            "results": results
+            "results": list(results)
         }
 
     def run_all_tests(self):
@@ -301,12 +312,16 @@ class IntentTestRunner:
         print("  MCP INTENT MAPPING TEST SUITE")
         print("="*80 + "\n")
 
-        for test_case in TEST_CASES:
-            result = self.run_test_case(test_case)
-            self.results.append(result)
+        # Run on the orchestrator's event loop, where its server sessions live
+        self.results.extend(_run_async(self._async_run_all_tests()))
 
         self.print_summary()
 
+    async def _async_run_all_tests(self) -> List[Dict[str, Any]]:
+        """Run every test case concurrently, bounded by MAX_CONCURRENT_QUERIES queries in flight"""
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+        return list(await asyncio.gather(*(self.run_test_case(test_case) for test_case in TEST_CASES)))
+
     def print_summary(self):
         """Print overall test summary"""
         print("\n" + "="*80)
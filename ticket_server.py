@@ -4,14 +4,28 @@ Provides tools for searching and managing support tickets
 """
 
 import asyncio
+import heapq
 import json
-from datetime import datetime, timedelta
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
-def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_tools=None, **extra):
+
+def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_tools=None,
+               ticket_id=None, allowed_values=None):
     """Standardise ticket-server error payloads for downstream LLM consumers."""
     payload = {"error": message}
     if reason:
@@ -21,12 +35,46 @@ def make_error(message, *, reason=None, hints=None, retryable=False, follow_up_t
     payload["retryable"] = retryable
     if follow_up_tools:
         payload["follow_up_tools"] = follow_up_tools
-    for key, value in extra.items():
-        if value is not None:
-            payload[key] = value
+    if ticket_id is not None:
+        payload["ticket_id"] = ticket_id
+    if allowed_values is not None:
+        payload["allowed_values"] = allowed_values
     return payload
 
 
+# Tool responses are compact JSON by default; set MCP_PRETTY=1 to indent them for debugging
+PRETTY_JSON = os.getenv("MCP_PRETTY") == "1"
+
+
+def serialize_result(result):
+    """Serialize a tool result for TextContent, using orjson when it is installed."""
+    if orjson is not None:
+        if PRETTY_JSON:
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+        return orjson.dumps(result).decode()
+    if PRETTY_JSON:
+        return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"))
+
+
+def freeze(value):
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Recursively copy frozen data back into plain dicts and lists for responses"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
 # Sample ticket data
 TICKETS = [
     {
@@ -244,67 +292,162 @@ TICKETS = [
     }
 ]
 
-
+# Ticket statuses; every record's status is interned to one of these so checks compare by identity
+OPEN = sys.intern("open")
+IN_PROGRESS = sys.intern("in_progress")
+RESOLVED = sys.intern("resolved")
+
+# Intern the low-cardinality fields and tags too, so equal values share one string object
+for _ticket in TICKETS:
+    for _field in ("status", "priority", "category", "os", "assignee"):
+        _ticket[_field] = sys.intern(_ticket[_field])
+    _ticket["tags"][:] = map(sys.intern, _ticket["tags"])
+
+# The ticket store is read-only from here on; responses hand out thawed copies
+TICKETS = tuple(freeze(t) for t in TICKETS)
+
+# Known values of the vocabulary filters, keyed by lowercase form, so search_tickets accepts any
+# casing and rejects values that no ticket could match
+_VOCABULARY_FIELDS = ("status", "priority", "category")
+_ALLOWED_VALUES = {
+    field: {value.lower(): value for value in sorted({t[field] for t in TICKETS})}
+    for field in _VOCABULARY_FIELDS
+}
+
+# ticket_id -> position in TICKETS, for single-ticket lookups
+_TICKET_POSITIONS = {t["ticket_id"]: i for i, t in enumerate(TICKETS)}
+
+# Inverted indexes: ticket positions for each value of the exact-match search filters
+_INDEXED_FIELDS = ("ticket_id", "customer_id", "status", "priority", "category")
+_FIELD_POSITIONS = {field: defaultdict(set) for field in _INDEXED_FIELDS}
+for _position, _ticket in enumerate(TICKETS):
+    for _field in _INDEXED_FIELDS:
+        _FIELD_POSITIONS[_field][_ticket.get(_field)].add(_position)
+_NO_POSITIONS = frozenset()
+
+# Per-ticket columns (one tuple per field, indexed by position): the scans in find_similar_tickets,
+# calculate_metrics and search_tickets read these, and TICKETS is only touched to build responses
+_TAG_SETS = tuple(frozenset(t.get("tags", [])) for t in TICKETS)
+_CATEGORIES = tuple(t.get("category") for t in TICKETS)
+_OSES = tuple(t.get("os") for t in TICKETS)
+_PRIORITIES = tuple(t.get("priority") for t in TICKETS)
+_STATUSES = tuple(t["status"] for t in TICKETS)
+_OS_LOWER = tuple(t.get("os", "").lower() for t in TICKETS)
+
+# Positions whose OS contains each family name, so the common family-level os filter is a set lookup
+_OS_FAMILIES = ("windows", "linux", "macos", "ubuntu", "debian", "rhel", "centos")
+_OS_FAMILY_POSITIONS = {
+    family: frozenset(p for p, os_lower in enumerate(_OS_LOWER) if family in os_lower)
+    for family in _OS_FAMILIES
+}
+
+# Each ticket's tags as a bitmask over one tag vocabulary, so similarity scoring counts shared tags
+# with an integer AND plus popcount instead of intersecting sets
+_TAG_BITS = {}
+for _tags in _TAG_SETS:
+    for _tag in sorted(_tags):
+        _TAG_BITS.setdefault(_tag, 1 << len(_TAG_BITS))
+_TAG_MASKS = tuple(sum(_TAG_BITS[tag] for tag in tags) for tags in _TAG_SETS)
+
+# created_date as a YYYYMMDD int, and hours from creation to last update, per ticket (for calculate_metrics)
+_CREATED_INTS = tuple(int(t["created_date"].replace("-", "")) for t in TICKETS)
+_RESOLUTION_HOURS = tuple(
+    (date.fromisoformat(t.get("last_updated", t["created_date"]))
+     - date.fromisoformat(t["created_date"])).days * 24.0
+    for t in TICKETS
+)
+
+# Ticket positions ordered by created_date, with the sorted dates alongside for bisecting date ranges
+_BY_CREATED = tuple(sorted(range(len(TICKETS)), key=_CREATED_INTS.__getitem__))
+_CREATED_SORTED = tuple(TICKETS[p]["created_date"] for p in _BY_CREATED)
+_CREATED_INTS_SORTED = tuple(_CREATED_INTS[p] for p in _BY_CREATED)
+
+# Metric periods: days back from today, plus the start used for any other period (all time)
+_PERIOD_DAYS = {"last_7_days": 7, "last_30_days": 30, "last_90_days": 90}
+_ALL_TIME_START = ("2000-01-01", bisect_left(_CREATED_INTS_SORTED, 20000101))
+# Period starts depend only on the current day, so they are cached until it changes
+_period_starts = {"day": None, "starts": {}}
+
+# Lowercased subject, description and tags per ticket, the text that query searches
+_SEARCH_TEXT = tuple(
+    " ".join([t.get("subject", ""), t.get("description", ""), " ".join(t.get("tags", []))]).lower()
+    for t in TICKETS
+)
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def matches_text_search(ticket, query):
-    """Check if ticket matches text search query"""
-    query_lower = query.lower()
-    searchable_text = " ".join([
-        ticket.get("subject", ""),
-        ticket.get("description", ""),
-        " ".join(ticket.get("tags", []))
-    ]).lower()
-    return query_lower in searchable_text
-
-
-def filter_by_date_range(ticket, start_date, end_date):
-    """Filter ticket by date range"""
-    created = ticket.get("created_date", "")
-    if start_date and created < start_date:
-        return False
-    if end_date and created > end_date:
-        return False
-    return True
-
-
-def calculate_metrics(tickets, time_period):
+def ticket_position(ticket_id):
+    """Position of the ticket with this ID in TICKETS, or None (unhashable IDs match nothing)"""
+    try:
+        return _TICKET_POSITIONS.get(ticket_id)
+    except TypeError:
+        return None
+
+
+def invalid_filter_error(field, value):
+    """Error payload for a status/priority/category filter value outside the known vocabulary"""
+    allowed = list(_ALLOWED_VALUES[field].values())
+    return make_error(
+        f"Invalid {field} '{value}'",
+        reason=f"No ticket has {field} '{value}', so the search could only come back empty.",
+        hints=[
+            f"Use one of: {', '.join(allowed)}.",
+            f"Omit {field} to search across all values."
+        ],
+        retryable=True,
+        follow_up_tools=["search_tickets"],
+        allowed_values=allowed
+    )
+
+
+def field_positions(field, value):
+    """Positions of tickets whose field equals value (unhashable values match nothing)"""
+    try:
+        return _FIELD_POSITIONS[field].get(value, _NO_POSITIONS)
+    except TypeError:
+        return _NO_POSITIONS
+
+
+def period_start(time_period):
+    """(start_date, first position in _BY_CREATED) for a metrics period; recomputed once per day"""
+    today = date.today()
+    if _period_starts["day"] != today:
+        starts = {}
+        for period, days in _PERIOD_DAYS.items():
+            start_date = (today - timedelta(days=days)).isoformat()
+            starts[period] = (start_date, bisect_left(_CREATED_INTS_SORTED, int(start_date.replace("-", ""))))
+        _period_starts["day"] = today
+        _period_starts["starts"] = starts
+    if isinstance(time_period, str):
+        return _period_starts["starts"].get(time_period, _ALL_TIME_START)
+    return _ALL_TIME_START
+
+
+def calculate_metrics(time_period):
     """Calculate ticket metrics for a time period"""
-    # Define time period boundaries
-    today = datetime.now()
-    if time_period == "last_7_days":
-        start_date = (today - timedelta(days=7)).strftime("%Y-%m-%d")
-    elif time_period == "last_30_days":
-        start_date = (today - timedelta(days=30)).strftime("%Y-%m-%d")
-    elif time_period == "last_90_days":
-        start_date = (today - timedelta(days=90)).strftime("%Y-%m-%d")
-    else:
-        start_date = "2000-01-01"
-
-    # Filter tickets by date
-    period_tickets = [t for t in tickets if t.get("created_date", "") >= start_date]
-
-    # Calculate metrics
-    total = len(period_tickets)
-    open_count = len([t for t in period_tickets if t["status"] == "open"])
-    in_progress = len([t for t in period_tickets if t["status"] == "in_progress"])
-    resolved = len([t for t in period_tickets if t["status"] == "resolved"])
+    start_date, first = period_start(time_period)
+
+    # Tickets created on or after start_date form a tail of the created_date ordering; count them
+    # by status in one pass. Resolution hours are whole days, so summing in date order is exact.
+    period_positions = _BY_CREATED[first:]
+    total = len(period_positions)
+    open_count = in_progress = resolved = 0
+    total_hours = 0
+    for p in period_positions:
+        status = _STATUSES[p]
+        if status is OPEN:
+            open_count += 1
+        elif status is IN_PROGRESS:
+            in_progress += 1
+        elif status is RESOLVED:
+            resolved += 1
+            total_hours += _RESOLUTION_HOURS[p]
 
     # Calculate average resolution time (simplified)
-    resolved_tickets = [t for t in period_tickets if t["status"] == "resolved"]
-    avg_resolution_time = 0
-    if resolved_tickets:
-        total_hours = 0
-        for t in resolved_tickets:
-            created = datetime.strptime(t["created_date"], "%Y-%m-%d")
-            updated = datetime.strptime(t.get("last_updated", t["created_date"]), "%Y-%m-%d")
-            hours = (updated - created).total_seconds() / 3600
-            total_hours += hours
-        avg_resolution_time = round(total_hours / len(resolved_tickets), 1)
+    avg_resolution_time = round(total_hours / resolved, 1) if resolved else 0
 
     return {
         "time_period": time_period,
@@ -317,46 +460,117 @@ def calculate_metrics(tickets, time_period):
     }
 
 
-def find_similar_tickets(reference_ticket, all_tickets, limit):
-    """Find similar tickets based on tags, category, and OS"""
-    similar = []
-    ref_tags = set(reference_ticket.get("tags", []))
-    ref_category = reference_ticket.get("category")
-    ref_os = reference_ticket.get("os")
-
-    for ticket in all_tickets:
-        if ticket["ticket_id"] == reference_ticket["ticket_id"]:
-            continue
+def find_similar_tickets(reference_position, limit):
+    """Find tickets similar to the ticket at reference_position based on tags, category, and OS"""
+    ref_tags = _TAG_SETS[reference_position]
+    ref_mask = _TAG_MASKS[reference_position]
+    ref_category = _CATEGORIES[reference_position]
+    ref_os = _OSES[reference_position]
+    ref_priority = _PRIORITIES[reference_position]
+
+    # Score every ticket in one pass over the columns: 20 points per common tag,
+    # 30 for the same category, 20 for the same OS and 10 for the same priority
+    scores = [
+        (ref_mask & mask).bit_count() * 20 + 30 * (category == ref_category)
+        + 20 * (os_name == ref_os) + 10 * (priority == ref_priority)
+        for mask, category, os_name, priority in zip(_TAG_MASKS, _CATEGORIES, _OSES, _PRIORITIES)
+    ]
+    scored = [(position, score) for position, score in enumerate(scores)
+              if score > 0 and position != reference_position]
 
-        ticket_tags = set(ticket.get("tags", []))
-        common_tags = ref_tags & ticket_tags
+    # Highest scores first; equal scores keep their scan order
+    if limit < 0:
+        # A negative limit slices from the end, as the original sort-then-slice did
+        top = sorted(scored, key=itemgetter(1), reverse=True)[:limit]
+    else:
+        top = heapq.nlargest(limit, scored, key=itemgetter(1))
 
-        # Calculate similarity score
-        score = 0
-        score += len(common_tags) * 20  # 20 points per common tag
-        if ticket.get("category") == ref_category:
-            score += 30
-        if ticket.get("os") == ref_os:
-            score += 20
-        if ticket.get("priority") == reference_ticket.get("priority"):
-            score += 10
+    # Full entries (and their common tags) only for the tickets that made the cut
+    return [
+        {
+            "ticket": thaw(TICKETS[position]),
+            "similarity_score": score,
+            "common_tags": list(ref_tags & _TAG_SETS[position])
+        }
+        for position, score in top
+    ]
 
-        if score > 0:
-            similar.append({
-                "ticket": ticket,
-                "similarity_score": score,
-                "common_tags": list(common_tags)
-            })
 
-    # Sort by similarity score and limit
-    similar.sort(key=lambda x: x["similarity_score"], reverse=True)
-    return similar[:limit]
+# Error payloads for each not-found site, built once; callers fill in the message and ticket_id
+_ERR_TICKET_NOT_FOUND = make_error(
+    "Ticket not found",
+    reason="The ticket_id did not match any tickets in the dataset.",
+    hints=[
+        "Call search_tickets with customer_id or priority filters to rediscover the ticket.",
+        "Verify the ticket_id format (e.g., TKT-1001)."
+    ],
+    retryable=True,
+    follow_up_tools=["search_tickets"]
+)
+_ERR_REFERENCE_NOT_FOUND = make_error(
+    "Ticket not found",
+    reason="Cannot compute similarity because the reference ticket is missing.",
+    hints=[
+        "Search for tickets by subject or tags using search_tickets.",
+        "Make sure the ticket_id belongs to the same dataset (TKT-####)."
+    ],
+    retryable=True,
+    follow_up_tools=["search_tickets"]
+)
 
 
 # ============================================================================
 # REGULAR PYTHON FUNCTIONS - Can be called directly without MCP
 # ============================================================================
 
+# search_tickets filter arguments, in the order filters_applied lists them
+_FILTER_NAMES = ("ticket_id", "customer_id", "status", "priority", "category", "os", "query",
+                 "start_date", "end_date")
+
+
+def match_positions(ticket_id, customer_id, status, priority, category, os, query, start_date, end_date):
+    """Positions (in TICKETS order) of tickets matching normalized search filters; falsy filters are ignored"""
+    # Exact-match filters intersect their index sets, smallest posting list first so every step
+    # works within the tightest candidate set; the remaining filters scan what is left
+    postings = [field_positions(field, value)
+                for field, value in (("ticket_id", ticket_id), ("customer_id", customer_id), ("status", status),
+                                     ("priority", priority), ("category", category))
+                if value]
+    candidates = None
+    if postings:
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+
+    # Date bounds compare as strings, so partial dates like "2025-10" still work; bisect the sorted dates
+    if start_date or end_date:
+        low = bisect_left(_CREATED_SORTED, start_date) if start_date else 0
+        high = bisect_right(_CREATED_SORTED, end_date) if end_date else len(_CREATED_SORTED)
+        in_range = set(_BY_CREATED[low:high])
+        candidates = in_range if candidates is None else candidates & in_range
+
+    # An OS family name matches a precomputed bucket; any other text falls back to the substring scan
+    os_lower = os.lower() if os else None
+    family = _OS_FAMILY_POSITIONS.get(os_lower)
+    if family is not None:
+        candidates = family if candidates is None else candidates & family
+
+    positions = range(len(TICKETS)) if candidates is None else sorted(candidates)
+
+    # The substring filters run as one fused pass over the candidates, specialized to the ones given,
+    # so no per-row generator hops are paid
+    os_needle = os_lower if os and family is None else None
+    query_lower = query.lower() if query else None
+    if os_needle is None and query_lower is None:
+        return tuple(positions)
+    if query_lower is None:
+        matches = [p for p in positions if os_needle in _OS_LOWER[p]]
+    elif os_needle is None:
+        matches = [p for p in positions if query_lower in _SEARCH_TEXT[p]]
+    else:
+        matches = [p for p in positions if os_needle in _OS_LOWER[p] and query_lower in _SEARCH_TEXT[p]]
+    return tuple(matches)
+
+
 def search_tickets(ticket_id=None, customer_id=None, status=None, priority=None,
                   category=None, os=None, query=None, start_date=None, end_date=None):
     """
@@ -369,58 +583,45 @@ def search_tickets(ticket_id=None, customer_id=None, status=None, priority=None,
     Args:
         ticket_id: Specific ticket ID
         customer_id: Filter by customer
-        status: Ticket status (open, in_progress, resolved)
-        priority: Priority level (critical, high, medium, low)
-        category: Ticket category
+        status: Ticket status (open, in_progress, resolved; any casing)
+        priority: Priority level (critical, high, medium, low; any casing)
+        category: Ticket category (any casing)
         os: Operating system (partial match)
         query: Text search (searches subject, description, tags)
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
     
     Returns:
-        dict: {"tickets": [...], "total_count": int, "filters_applied": {...}}
+        dict: {"tickets": [...], "total_count": int, "filters_applied": {...}},
+        or an error dict when status, priority or category is not a known value
     """
-    # Filter tickets based on criteria
-    results = TICKETS.copy()
-
-    # Apply filters
-    if ticket_id:
-        results = [t for t in results if t["ticket_id"] == ticket_id]
-
-    if customer_id:
-        results = [t for t in results if t["customer_id"] == customer_id]
-
-    if status:
-        results = [t for t in results if t["status"] == status]
-
-    if priority:
-        results = [t for t in results if t["priority"] == priority]
-
-    if category:
-        results = [t for t in results if t.get("category") == category]
-
-    if os:
-        results = [t for t in results if os.lower() in t.get("os", "").lower()]
-
-    if query:
-        results = [t for t in results if matches_text_search(t, query)]
-
-    if start_date or end_date:
-        results = [
-            t for t in results
-            if filter_by_date_range(t, start_date, end_date)
-        ]
+    # Vocabulary filters match any casing of a known value; unknown values are rejected up front
+    normalized = []
+    for field, value in zip(_VOCABULARY_FIELDS, (status, priority, category)):
+        if value:
+            canonical = _ALLOWED_VALUES[field].get(value.lower()) if isinstance(value, str) else None
+            if canonical is None:
+                return invalid_filter_error(field, value)
+            value = canonical
+        normalized.append(value)
+    status, priority, category = normalized
+
+    # Falsy filters are ignored, the same as omitted ones
+    filters = tuple(value or None for value in (ticket_id, customer_id, status, priority, category,
+                                                   os, query, start_date, end_date))
+    positions = match_positions(*filters)
+    results = [thaw(TICKETS[p]) for p in positions]
+
+    filters_applied = {}
+    for name, value in zip(_FILTER_NAMES, (ticket_id, customer_id, status, priority, category,
+                                           os, query, start_date, end_date)):
+        if value:
+            filters_applied[name] = value
 
     return {
         "tickets": results,
         "total_count": len(results),
-        "filters_applied": {
-            k: v for k, v in {
-                "ticket_id": ticket_id, "customer_id": customer_id, "status": status,
-                "priority": priority, "category": category, "os": os, "query": query,
-                "start_date": start_date, "end_date": end_date
-            }.items() if v
-        }
+        "filters_applied": filters_applied
     }
 
 
@@ -438,21 +639,14 @@ def get_ticket_details(ticket_id):
     Returns:
         dict: Ticket details or error dict
     """
-    ticket = next((t for t in TICKETS if t["ticket_id"] == ticket_id), None)
-
-    if not ticket:
-        return make_error(
-            f"Ticket {ticket_id} not found",
-            reason="The ticket_id did not match any tickets in the dataset.",
-            hints=[
-                "Call search_tickets with customer_id or priority filters to rediscover the ticket.",
-                "Verify the ticket_id format (e.g., TKT-1001)."
-            ],
-            retryable=True,
-            follow_up_tools=["search_tickets"],
-            ticket_id=ticket_id
-        )
-    return ticket.copy()
+    position = ticket_position(ticket_id)
+
+    if position is None:
+        payload = {**_ERR_TICKET_NOT_FOUND, "error": f"Ticket {ticket_id} not found"}
+        if ticket_id is not None:
+            payload["ticket_id"] = ticket_id
+        return payload
+    return thaw(TICKETS[position])
 
 
 def get_ticket_metrics(time_period="last_7_days"):
@@ -469,7 +663,7 @@ def get_ticket_metrics(time_period="last_7_days"):
     Returns:
         dict: Metrics including counts, resolution time, etc.
     """
-    return calculate_metrics(TICKETS, time_period)
+    return calculate_metrics(time_period)
 
 
 def find_similar_tickets_to(ticket_id, limit=5):
@@ -487,25 +681,18 @@ def find_similar_tickets_to(ticket_id, limit=5):
     Returns:
         dict: Similar tickets with relevance scores
     """
-    reference_ticket = next((t for t in TICKETS if t["ticket_id"] == ticket_id), None)
-
-    if not reference_ticket:
-        return make_error(
-            f"Ticket {ticket_id} not found",
-            reason="Cannot compute similarity because the reference ticket is missing.",
-            hints=[
-                "Search for tickets by subject or tags using search_tickets.",
-                "Make sure the ticket_id belongs to the same dataset (TKT-####)."
-            ],
-            retryable=True,
-            follow_up_tools=["search_tickets"],
-            ticket_id=ticket_id
-        )
+    reference_position = ticket_position(ticket_id)
 
-    similar = find_similar_tickets(reference_ticket, TICKETS, int(limit))
+    if reference_position is None:
+        payload = {**_ERR_REFERENCE_NOT_FOUND, "error": f"Ticket {ticket_id} not found"}
+        if ticket_id is not None:
+            payload["ticket_id"] = ticket_id
+        return payload
+
+    similar = find_similar_tickets(reference_position, int(limit))
     return {
         "reference_ticket_id": ticket_id,
-        "reference_ticket_subject": reference_ticket.get("subject"),
+        "reference_ticket_subject": TICKETS[reference_position].get("subject"),
         "similar_tickets": [
             {
                 "ticket_id": s["ticket"]["ticket_id"],
@@ -529,89 +716,107 @@ def find_similar_tickets_to(ticket_id, limit=5):
 app = Server("ticket-management-server")
 
 
+# Tool definitions never change, so they are built once at import and reused by list_tools
+TOOLS = [
+    Tool(
+        name="search_tickets",
+        description="Search for tickets by various criteria (status, priority, assignee, etc.)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Text search query (searches subject, description, tags)"},
+                "ticket_id": {"type": "string", "description": "Specific ticket ID"},
+                "customer_id": {"type": "string", "description": "Filter by customer ID"},
+                "status": {"type": "string", "description": "Ticket status (open, in_progress, resolved)"},
+                "priority": {"type": "string", "description": "Priority level (critical, high, medium, low)"},
+                "category": {"type": "string", "description": "Ticket category"},
+                "os": {"type": "string", "description": "Operating system"},
+                "start_date": {"type": "string", "description": "Start date (YYYY-MM-DD)"},
+                "end_date": {"type": "string", "description": "End date (YYYY-MM-DD)"}
+            }
+        }
+    ),
+    Tool(
+        name="get_ticket_details",
+        description="Retrieve detailed information about a specific ticket by ID",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "ticket_id": {"type": "string", "description": "Unique ticket identifier"}
+            },
+            "required": ["ticket_id"]
+        }
+    ),
+    Tool(
+        name="get_ticket_metrics",
+        description="Get metrics and statistics for tickets (resolution time, volume, etc.)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "time_period": {"type": "string", "description": "Time period (last_7_days, last_30_days, last_90_days)"}
+            }
+        }
+    ),
+    Tool(
+        name="find_similar_tickets",
+        description="Find tickets similar to a given ticket based on content and metadata",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "ticket_id": {"type": "string", "description": "Reference ticket ID"},
+                "limit": {"type": "number", "description": "Maximum number of similar tickets to return"}
+            },
+            "required": ["ticket_id"]
+        }
+    )
+]
+
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available ticket management tools"""
-    return [
-        Tool(
-            name="search_tickets",
-            description="Search for tickets by various criteria (status, priority, assignee, etc.)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "Text search query (searches subject, description, tags)"},
-                    "ticket_id": {"type": "string", "description": "Specific ticket ID"},
-                    "customer_id": {"type": "string", "description": "Filter by customer ID"},
-                    "status": {"type": "string", "description": "Ticket status (open, in_progress, resolved)"},
-                    "priority": {"type": "string", "description": "Priority level (critical, high, medium, low)"},
-                    "category": {"type": "string", "description": "Ticket category"},
-                    "os": {"type": "string", "description": "Operating system"},
-                    "start_date": {"type": "string", "description": "Start date (YYYY-MM-DD)"},
-                    "end_date": {"type": "string", "description": "End date (YYYY-MM-DD)"}
-                }
-            }
-        ),
-        Tool(
-            name="get_ticket_details",
-            description="Retrieve detailed information about a specific ticket by ID",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "ticket_id": {"type": "string", "description": "Unique ticket identifier"}
-                },
-                "required": ["ticket_id"]
-            }
-        ),
-        Tool(
-            name="get_ticket_metrics",
-            description="Get metrics and statistics for tickets (resolution time, volume, etc.)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "time_period": {"type": "string", "description": "Time period (last_7_days, last_30_days, last_90_days)"}
-                }
-            }
-        ),
-        Tool(
-            name="find_similar_tickets",
-            description="Find tickets similar to a given ticket based on content and metadata",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "ticket_id": {"type": "string", "description": "Reference ticket ID"},
-                    "limit": {"type": "number", "description": "Maximum number of similar tickets to return"}
-                },
-                "required": ["ticket_id"]
-            }
-        )
-    ]
+    return TOOLS
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-    """Handle tool calls - delegates to regular Python functions"""
+TOOL_HANDLERS = {
+    "search_tickets": lambda arguments: search_tickets(**arguments),
+    "get_ticket_details": lambda arguments: get_ticket_details(arguments.get("ticket_id")),
+    "get_ticket_metrics": lambda arguments: get_ticket_metrics(arguments.get("time_period", "last_7_days")),
+    "find_similar_tickets": lambda arguments: find_similar_tickets_to(
+        arguments.get("ticket_id"), arguments.get("limit", 5)),
+}
 
-    if name == "search_tickets":
-        result = search_tickets(**arguments)
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
-    elif name == "get_ticket_details":
-        result = get_ticket_details(arguments.get("ticket_id"))
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+def render_tool(name, arguments):
+    """Run a tool and serialize its result as TextContent text"""
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return serialize_result(handler(arguments))
 
-    elif name == "get_ticket_metrics":
-        result = get_ticket_metrics(arguments.get("time_period", "last_7_days"))
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
-    elif name == "find_similar_tickets":
-        result = find_similar_tickets_to(
-            arguments.get("ticket_id"),
-            arguments.get("limit", 5)
-        )
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+# Metrics depend on today's date; every other tool's response only depends on the static TICKETS data
+_CACHEABLE_TOOLS = frozenset({"search_tickets", "get_ticket_details", "find_similar_tickets"})
 
-    else:
-        raise ValueError(f"Unknown tool: {name}")
+
+@lru_cache(maxsize=512)
+def render_tool_cached(name, frozen_arguments):
+    """Memoized render_tool, so a repeated call skips both the lookup and the serialization"""
+    return render_tool(name, dict(frozen_arguments))
+
+
+@app.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    """Handle tool calls - delegates to regular Python functions"""
+    if name in _CACHEABLE_TOOLS:
+        try:
+            frozen_arguments = frozenset(arguments.items())
+        except TypeError:
+            # Unhashable argument values (e.g. lists) can't be cache keys; render them directly
+            pass
+        else:
+            return [TextContent(type="text", text=render_tool_cached(name, frozen_arguments))]
+    return [TextContent(type="text", text=render_tool(name, arguments))]
 
 
 async def main():
@@ -625,4 +830,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:  # uvloop is optional (and unavailable on Windows); use the default loop
+        asyncio.run(main())
+    else:
+        uvloop.run(main())